@@ -1,114 +1,179 @@
 #!/usr/bin/env python3
 """Export all messages with LLM extraction results for manual labeling."""
 
+import hashlib
 import json
 import os
+import sqlite3
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
+import xlsxwriter
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.storage.database import Database
+from export_to_excel import column_widths
 
 
 def load_all_messages_from_json(json_path: str) -> List[Dict]:
     """Load all messages from dc_tracker.json."""
+    if HAS_ORJSON:
+        with open(json_path, 'rb') as f:
+            return orjson.loads(f.read())
     with open(json_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
-def get_message_actions_map(db: Database) -> Dict[int, List[Dict]]:
-    """Get a map of message_id -> list of trading actions."""
-    # Get all trading actions with their message_id
-    conn = db._get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT ta.*, m.sender, m.send_time, m.message
-        FROM trading_actions ta
-        LEFT JOIN messages m ON ta.message_id = m.id
-        ORDER BY ta.extracted_at DESC
+def get_database_messages(conn: sqlite3.Connection) -> List[Dict]:
+    """Get all stored messages (newest first) with the fields used for matching."""
+    cursor = conn.execute("""
+        SELECT id, sender, send_time, message
+        FROM messages
+        ORDER BY created_at DESC
     """)
+    return [dict(row) for row in cursor]
+
+
+def get_primary_actions(conn: sqlite3.Connection) -> Dict[int, Dict]:
+    """Get a map of message_id -> most recently extracted trading action.
     
-    rows = cursor.fetchall()
-    conn.close()
-    
-    # Group actions by message_id
-    actions_map = {}
-    for row in rows:
-        msg_id = row['message_id']
-        if msg_id:
-            if msg_id not in actions_map:
-                actions_map[msg_id] = []
-            actions_map[msg_id].append(dict(row))
-    
-    return actions_map
+    Each action dict also carries "action_count", the number of actions stored
+    for that message. Picking and counting is done by SQLite in one query.
+    """
+    # Only fetch the columns the export uses; the message columns come from the JSON file
+    cursor = conn.execute("""
+        SELECT id, message_id, action_type, symbol, price, quantity,
+               confidence, action_signal_time, us_to_iso(extracted_at_us) AS extracted_at,
+               action_count
+        FROM (
+            SELECT ta.*,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY ta.message_id
+                       ORDER BY ta.extracted_at_us DESC, ta.id DESC
+                   ) AS rn,
+                   COUNT(*) OVER (PARTITION BY ta.message_id) AS action_count
+            FROM trading_actions ta
+            WHERE ta.message_id IS NOT NULL
+        )
+        WHERE rn = 1
+    """)
+    return {row['message_id']: dict(row) for row in cursor}
+
+
+def build_message_id_index(
+    db_messages: List[Dict]
+) -> Tuple[Dict[Tuple, int], Dict[Tuple, int]]:
+    """Index database messages for constant-time lookup.
+
+    Returns two dicts: one keyed by (sender, send_time, message) and one keyed
+    by (sender, send_time). Messages are indexed in reverse so that, for
+    duplicate keys, the earliest entry in db_messages wins.
+    """
+    full_idx = {}
+    pair_idx = {}
+    for db_msg in reversed(db_messages):
+        sender = db_msg.get("sender")
+        send_time = db_msg.get("send_time")
+        full_idx[(sender, send_time, db_msg.get("message"))] = db_msg.get("id")
+        pair_idx[(sender, send_time)] = db_msg.get("id")
+    return full_idx, pair_idx
 
 
 def find_database_message_id(
     json_message: Dict,
-    db_messages: List[Dict]
+    message_index: Tuple[Dict[Tuple, int], Dict[Tuple, int]]
 ) -> Optional[int]:
     """Find database message ID by matching sender, send_time, and message content."""
+    full_idx, pair_idx = message_index
     json_sender = json_message.get("sender", "")
     json_send_time = json_message.get("send_time", "")
     json_message_text = json_message.get("message", "")
     
     # Try exact match first
-    for db_msg in db_messages:
-        if (db_msg.get("sender") == json_sender and
-            db_msg.get("send_time") == json_send_time and
-            db_msg.get("message") == json_message_text):
-            return db_msg.get("id")
+    db_msg_id = full_idx.get((json_sender, json_send_time, json_message_text))
+    if db_msg_id is not None:
+        return db_msg_id
     
     # Try match by sender and send_time (in case message content differs slightly)
-    for db_msg in db_messages:
-        if (db_msg.get("sender") == json_sender and
-            db_msg.get("send_time") == json_send_time):
-            return db_msg.get("id")
+    return pair_idx.get((json_sender, json_send_time))
+
+
+def compute_export_fingerprint(json_path: str, conn: sqlite3.Connection) -> str:
+    """Fingerprint of the export inputs: JSON file contents plus database contents.
     
-    return None
+    The database part is the change counter its triggers bump on every insert,
+    update and delete of a message or trading action, not file times: opening
+    a Database touches its -wal file even when nothing is written.
+    """
+    with open(json_path, 'rb') as f:
+        key = hashlib.sha256(f.read()).hexdigest()
+    row = conn.execute("SELECT value FROM action_stats WHERE key = 'changes'").fetchone()
+    return f"{key}:{int(row[0])}"
 
 
 def export_all_messages_for_labeling(
     json_path: str = "dc_tracker.json",
-    output_file: str = "all_messages_for_labeling.xlsx"
+    output_file: str = "all_messages_for_labeling.xlsx",
+    force: bool = False
 ):
-    """Export all messages with LLM results for manual labeling."""
-    
-    print("📊 Loading messages and extraction results...")
+    """Export all messages with LLM results for manual labeling.
     
-    # Load all messages from JSON
-    json_messages = load_all_messages_from_json(json_path)
-    print(f"   Loaded {len(json_messages)} messages from {json_path}")
+    Skips regeneration when neither the JSON file nor the database changed
+    since the last export (tracked in {output_file}.stamp.json), unless force.
+    """
     
-    # Load database
     db = Database()
+    try:
+        # Nothing to do if the inputs are unchanged since the last export
+        stamp_path = f"{output_file}.stamp.json"
+        with db._read_conn() as conn:
+            fingerprint = compute_export_fingerprint(json_path, conn)
+        if not force and os.path.exists(output_file) and os.path.exists(stamp_path):
+            with open(stamp_path, 'r', encoding='utf-8') as f:
+                if json.load(f).get("fingerprint") == fingerprint:
+                    print(f"✅ {output_file} is up to date")
+                    return
+        
+        print("📊 Loading messages and extraction results...")
+        
+        # Load all messages from JSON
+        json_messages = load_all_messages_from_json(json_path)
+        print(f"   Loaded {len(json_messages)} messages from {json_path}")
+        
+        # Read the database through one connection
+        with db._read_conn() as conn:
+            # Get all messages from database
+            db_messages = get_database_messages(conn)
+            print(f"   Found {len(db_messages)} messages in database")
+            
+            # Get the primary trading action (and action count) per message
+            primary_actions = get_primary_actions(conn)
+            print(f"   Found {sum(a['action_count'] for a in primary_actions.values())} trading actions")
+    finally:
+        db.close()
     
-    # Get all messages from database
-    db_messages = db.get_recent_messages(limit=10000)
-    print(f"   Found {len(db_messages)} messages in database")
-    
-    # Get all trading actions grouped by message_id
-    actions_map = get_message_actions_map(db)
-    print(f"   Found {sum(len(v) for v in actions_map.values())} trading actions")
+    # Index database messages once so each lookup below is O(1)
+    message_index = build_message_id_index(db_messages)
     
     # Prepare Excel data
     excel_rows = []
     
     for idx, json_msg in enumerate(json_messages, 1):
         # Find corresponding database message
-        db_msg_id = find_database_message_id(json_msg, db_messages)
-        
-        # Get trading actions for this message (if any)
-        actions = actions_map.get(db_msg_id, []) if db_msg_id else []
+        db_msg_id = find_database_message_id(json_msg, message_index)
         
-        # Use the first action if multiple exist (or combine them)
-        primary_action = actions[0] if actions else None
+        # Use the most recent action if multiple exist
+        primary_action = primary_actions.get(db_msg_id) if db_msg_id else None
         
         # Prepare row data
         row = {
@@ -128,7 +193,7 @@ def export_all_messages_for_labeling(
             "LLM Confidence": round(primary_action.get("confidence", 0), 3) if primary_action else "",
             "LLM Signal Time": primary_action.get("action_signal_time", "") if primary_action else "",
             "LLM Extracted At": primary_action.get("extracted_at", "") if primary_action else "",
-            "Number of Actions": len(actions),  # In case multiple actions per message
+            "Number of Actions": primary_action["action_count"] if primary_action else 0,  # In case multiple actions per message
             
             # Manual Labeling Columns (empty for user to fill)
             "Manual: Is Trade Signal?": "",
@@ -142,33 +207,38 @@ def export_all_messages_for_labeling(
         
         excel_rows.append(row)
     
-    # Create DataFrame
+    # DataFrame used for column sizing
     df = pd.DataFrame(excel_rows)
     
     # Create Excel file
     print(f"\n📝 Creating Excel file: {output_file}...")
     
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='All Messages for Labeling', index=False)
-        
-        # Get the worksheet to format it
-        worksheet = writer.sheets['All Messages for Labeling']
-        
-        # Freeze first row
-        worksheet.freeze_panes = 'A2'
-        
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    # Stream rows straight to disk: constant_memory flushes each row once the next
+    # one starts, so the workbook is never held in memory.
+    workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('All Messages for Labeling')
+    
+    # Freeze first row
+    worksheet.freeze_panes(1, 0)
+    
+    # Auto-adjust column widths (capped at 50 characters)
+    for i, width in enumerate(column_widths(df)):
+        worksheet.set_column(i, i, width)
+    
+    # Header styled like pandas' to_excel output
+    header_format = workbook.add_format({
+        'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'
+    })
+    worksheet.write_row(0, 0, list(df.columns), header_format)
+    
+    # Write the original row values (None becomes an empty cell), one row at a time
+    for row_idx, row in enumerate(excel_rows, 1):
+        worksheet.write_row(row_idx, 0, list(row.values()))
+    
+    workbook.close()
+    
+    with open(stamp_path, 'w', encoding='utf-8') as f:
+        json.dump({"fingerprint": fingerprint}, f)
     
     # Print summary
     total_messages = len(excel_rows)
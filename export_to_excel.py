@@ -5,43 +5,74 @@ from src.storage.database import Database
 import pandas as pd
 from datetime import datetime
 
+# Database column -> Excel header, in sheet order
+EXCEL_COLUMNS = {
+    'action_type': 'Action Type',
+    'symbol': 'Symbol',
+    'price': 'Price',
+    'quantity': 'Quantity',
+    'confidence': 'Confidence',
+    'action_signal_time': 'Signal Time',
+    'extracted_at': 'Extracted At',
+    'sender': 'Sender',
+    'send_time': 'Message Send Time',
+    'message': 'Original Message',
+    'raw_message': 'Raw Message',
+    'message_id': 'Message ID',
+    'id': 'Action ID',
+}
+
+
+def column_widths(df: pd.DataFrame, max_width: int = 50) -> pd.Series:
+    """Excel column widths fitted to the header and longest cell of each column."""
+    header_len = pd.Series(df.columns.astype(str).str.len(), index=df.columns)
+    body_len = df.astype(str).apply(lambda s: s.str.len().max()).fillna(0)
+    # Leave 2 characters of padding, capped at max_width
+    return pd.concat([header_len, body_len], axis=1).max(axis=1).clip(upper=max_width - 2) + 2
+
+
+def _format_worksheet(worksheet, df: pd.DataFrame) -> None:
+    """Freeze the header row and size columns to their contents (xlsxwriter)."""
+    worksheet.freeze_panes(1, 0)
+    for i, width in enumerate(column_widths(df)):
+        worksheet.set_column(i, i, width)
+
+
 def export_to_excel(output_file="trading_actions_results.xlsx"):
     """Export all trading actions to Excel."""
     
     db = Database()
     
-    # Get all actions
-    actions = db.get_recent_actions(limit=10000, min_confidence=0.0)
+    # Get all actions, as a DataFrame straight from the query (no dict per row)
+    actions = db.get_recent_actions_df(limit=10000, min_confidence=0.0)
     stats = db.get_action_statistics()
     
     print(f"📊 Exporting {len(actions)} trading actions to Excel...")
     
-    # Prepare data for Excel
-    excel_data = []
-    for action in actions:
-        excel_data.append({
-            'Action Type': action['action_type'].upper(),
-            'Symbol': action.get('symbol', ''),
-            'Price': action.get('price', ''),
-            'Quantity': action.get('quantity', ''),
-            'Confidence': round(action.get('confidence', 0), 3),
-            'Signal Time': action.get('action_signal_time', ''),
-            'Extracted At': action.get('extracted_at', ''),
-            'Sender': action.get('sender', ''),
-            'Message Send Time': action.get('send_time', ''),
-            'Original Message': action.get('message', ''),
-            'Raw Message': action.get('raw_message', ''),
-            'Message ID': action.get('message_id', ''),
-            'Action ID': action.get('id', '')
-        })
+    # Keep the exported columns in sheet order, then rename to display headers
+    df = actions.reindex(columns=list(EXCEL_COLUMNS))
+    df['action_type'] = df['action_type'].astype(str).str.upper()
+    df['confidence'] = df['confidence'].astype(float).round(3)
+    df = df.rename(columns=EXCEL_COLUMNS)
+    
+    # Low-cardinality text columns: store as category codes instead of one string per cell
+    for column in ['Action Type', 'Sender', 'Symbol']:
+        df[column] = df[column].astype('category')
     
-    # Create DataFrame
-    df = pd.DataFrame(excel_data)
+    # Split by action type in a single pass; sub-frames and counts are reused below
+    groups = dict(list(df.groupby('Action Type', sort=False, observed=True)))
+    buy_df = groups.get('BUY')
+    sell_df = groups.get('SELL')
+    high_conf = df[df['Confidence'] >= 0.8]
+    n_buy = len(buy_df) if buy_df is not None else 0
+    n_sell = len(sell_df) if sell_df is not None else 0
+    n_high_conf = len(high_conf)
     
     # Create Excel writer with multiple sheets
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
         # Main sheet with all actions
         df.to_excel(writer, sheet_name='All Actions', index=False)
+        _format_worksheet(writer.sheets['All Actions'], df)
         
         # Summary statistics sheet
         summary_data = {
@@ -63,23 +94,22 @@ def export_to_excel(output_file="trading_actions_results.xlsx"):
                 stats['by_type'].get('sell', 0),
                 stats['by_type'].get('hold', 0),
                 stats['by_type'].get('unknown', 0),
-                len(df[df['Price'].notna() & (df['Price'] != '')]),
-                len(df[df['Quantity'].notna() & (df['Quantity'] != '')]),
+                int((df['Price'].notna() & (df['Price'] != '')).sum()),
+                int((df['Quantity'].notna() & (df['Quantity'] != '')).sum()),
                 ', '.join([f"{k}({v})" for k, v in list(stats['top_symbols'].items())[:10]])
             ]
         }
         pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
         
         # Filtered sheets
-        if len(df[df['Action Type'] == 'BUY']) > 0:
-            df[df['Action Type'] == 'BUY'].to_excel(writer, sheet_name='Buy Actions', index=False)
+        if n_buy > 0:
+            buy_df.to_excel(writer, sheet_name='Buy Actions', index=False)
         
-        if len(df[df['Action Type'] == 'SELL']) > 0:
-            df[df['Action Type'] == 'SELL'].to_excel(writer, sheet_name='Sell Actions', index=False)
+        if n_sell > 0:
+            sell_df.to_excel(writer, sheet_name='Sell Actions', index=False)
         
         # High confidence actions (>= 0.8)
-        high_conf = df[df['Confidence'] >= 0.8]
-        if len(high_conf) > 0:
+        if n_high_conf > 0:
             high_conf.to_excel(writer, sheet_name='High Confidence (>=0.8)', index=False)
     
     print(f"✅ Successfully exported to {output_file}")
@@ -87,12 +117,12 @@ def export_to_excel(output_file="trading_actions_results.xlsx"):
     print(f"   Sheets created:")
     print(f"     - All Actions: {len(df)} rows")
     print(f"     - Summary: Statistics")
-    if len(df[df['Action Type'] == 'BUY']) > 0:
-        print(f"     - Buy Actions: {len(df[df['Action Type'] == 'BUY'])} rows")
-    if len(df[df['Action Type'] == 'SELL']) > 0:
-        print(f"     - Sell Actions: {len(df[df['Action Type'] == 'SELL'])} rows")
-    if len(high_conf) > 0:
-        print(f"     - High Confidence (>=0.8): {len(high_conf)} rows")
+    if n_buy > 0:
+        print(f"     - Buy Actions: {n_buy} rows")
+    if n_sell > 0:
+        print(f"     - Sell Actions: {n_sell} rows")
+    if n_high_conf > 0:
+        print(f"     - High Confidence (>=0.8): {n_high_conf} rows")
     
     return output_file
 
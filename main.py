@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 """Main entry point for Trading Action Extraction Agent."""
 
+import asyncio
 import os
 import sys
 import yaml
+from functools import lru_cache
 from pathlib import Path
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
@@ -15,6 +23,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.platforms.json_adapter import JSONAdapter
 from src.extractors.llm_extractor import LLMExtractor
+from src.extractors.semantic_cache import SemanticCache
 from src.services.validator import ActionValidator
 from src.services.message_processor import MessageProcessor
 from src.storage.database import Database
@@ -29,8 +38,14 @@ def load_config():
         if not config_path.exists():
             return {}
     
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f) or {}
+    return _load_yaml(str(config_path.resolve()))
+
+
+@lru_cache(maxsize=None)
+def _load_yaml(path: str) -> dict:
+    """Parse a YAML file once per resolved path (treat the result as read-only)."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
 
 
 def main():
@@ -43,9 +58,17 @@ def main():
     # Get settings with defaults
     json_path = config.get("json", {}).get("file_path", "dc_tracker.json")
     db_path = config.get("database", {}).get("path", "./data/trading_actions.db")
+    full_text_search = config.get("database", {}).get("full_text_search", False)
     min_confidence = config.get("extraction", {}).get("confidence_threshold", 0.7)
     llm_model = config.get("extraction", {}).get("llm_model", "gpt-4o-mini")
     llm_provider = config.get("extraction", {}).get("llm_provider", "openai")
+    max_retries = config.get("extraction", {}).get("max_retries", 3)
+    max_concurrency = config.get("extraction", {}).get("max_concurrency", 16)
+    rate_limit = config.get("extraction", {}).get("rate_limit")
+    use_batch_api = config.get("extraction", {}).get("use_batch_api", False)
+    semantic_cache = config.get("extraction", {}).get("semantic_cache", False)
+    semantic_threshold = config.get("extraction", {}).get("semantic_threshold", 0.92)
+    prescreen = config.get("extraction", {}).get("prescreen", True)
     
     # Initialize components
     print("📂 Initializing components...")
@@ -54,13 +77,16 @@ def main():
     adapter = JSONAdapter(json_path)
     
     # Database
-    database = Database(db_path)
+    database = Database(db_path, full_text_search=full_text_search)
     
     # LLM Extractor
     try:
         extractor = LLMExtractor(
             model=llm_model,
-            provider=llm_provider
+            provider=llm_provider,
+            cache=SemanticCache(semantic=semantic_cache, threshold=semantic_threshold),
+            max_retries=max_retries,
+            prescreen=prescreen
         )
     except Exception as e:
         print(f"❌ Error initializing LLM extractor: {e}")
@@ -81,8 +107,17 @@ def main():
     # Process messages
     print(f"📊 Processing messages from {json_path}...")
     try:
-        actions = processor.process_all()
+        if use_batch_api:
+            actions = processor.process_all(use_batch_api=True)
+        else:
+            actions = asyncio.run(
+                processor.aprocess_all(max_concurrency=max_concurrency, rate_limit=rate_limit)
+            )
         print(f"✅ Processed messages and extracted {len(actions)} trading actions")
+        if extractor.screened_out:
+            print(f"⏭️  Skipped the LLM for {extractor.screened_out} messages with no trading signal")
+        if processor.unavailable_skipped:
+            print(f"⚠️  {processor.unavailable_skipped} messages not saved (LLM provider unavailable); run again to retry them")
         
         # Show statistics
         stats = database.get_action_statistics()
@@ -96,6 +131,9 @@ def main():
         import traceback
         traceback.print_exc()
         return
+    finally:
+        processor.close()
+        database.close()
     
     print("\n✅ Processing complete!")
     print("💡 Run 'streamlit run src/ui/dashboard.py' to view the dashboard")
@@ -1,21 +1,31 @@
 #!/usr/bin/env python3
 """Translate messages in dc_tracker.json from Chinese to English."""
 
+import argparse
+import asyncio
+import hashlib
 import json
 import os
 import re
+import sqlite3
 import sys
 from pathlib import Path
 from typing import Dict, List
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI
     HAS_OPENAI = True
 except ImportError:
     HAS_OPENAI = False
     print("Error: OpenAI library not available. Install with: pip install openai")
     sys.exit(1)
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -23,70 +33,161 @@ try:
 except ImportError:
     pass
 
+# Maximum number of translation requests in flight at once
+MAX_CONCURRENCY = 16
+
+# Number of texts packed into each translation request
+BATCH_SIZE = 20
+
+# On-disk cache of previous translations, keyed by SHA-256 of the source text
+CACHE_PATH = ".translation_cache.db"
+
+# CJK Unified Ideographs; compiled once since it runs for every message
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+
 
-def translate_with_openai(text: str, client: OpenAI) -> str:
-    """Translate text from Chinese to English using OpenAI."""
+async def translate_with_openai(texts: List[str], client: AsyncOpenAI) -> List[str]:
+    """Translate a batch of texts from Chinese to English using OpenAI.
+    
+    The texts are sent as one JSON array and the model returns the
+    translations in the same order. If a batch comes back malformed, its
+    texts are retried one per request, one after another so the caller's
+    concurrency slot still bounds the requests in flight; a text that still
+    fails is returned untranslated.
+    """
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {
                     "role": "system",
-                    "content": "You are a translator. Translate the following Chinese text to English. Only return the translation, no explanations. Preserve any stock symbols, numbers, and technical terms."
+                    "content": "You are a translator. Translate each Chinese text in the given JSON array to English. Preserve any stock symbols, numbers, and technical terms. Return only a JSON object of the form {\"translations\": [...]} with one translation per input text, in the same order."
                 },
                 {
                     "role": "user",
-                    "content": text
+                    "content": json.dumps(texts, ensure_ascii=False)
                 }
             ],
-            temperature=0.3
+            temperature=0.3,
+            response_format={"type": "json_object"}
         )
-        return response.choices[0].message.content.strip()
+        translations = json.loads(response.choices[0].message.content)["translations"]
+        if len(translations) != len(texts) or not all(isinstance(t, str) for t in translations):
+            raise ValueError(f"expected {len(texts)} translations, got {len(translations)}")
+        return [t.strip() for t in translations]
     except Exception as e:
+        if len(texts) > 1:
+            print(f"Batch translation error ({e}); retrying {len(texts)} texts individually")
+            return [(await translate_with_openai([t], client))[0] for t in texts]
         print(f"Translation error: {e}")
-        return text
+        return texts
 
 
 def has_chinese(text: str) -> bool:
     """Check if text contains Chinese characters."""
-    return bool(re.search(r'[\u4e00-\u9fff]', text))
-
-
-def translate_messages(messages: List[Dict], api_key: str) -> List[Dict]:
-    """Translate messages from Chinese to English."""
-    client = OpenAI(api_key=api_key)
-    translated = []
-    
-    print(f"Translating {len(messages)} messages...")
-    for i, msg in enumerate(messages):
-        if (i + 1) % 10 == 0:
-            print(f"  Progress: {i + 1}/{len(messages)}")
-        
-        original_text = msg.get("message", "")
-        if not original_text:
-            translated.append(msg)
-            continue
-        
-        # Check if text contains Chinese
-        if has_chinese(original_text):
-            try:
-                translated_text = translate_with_openai(original_text, client)
-                # Update message with English translation, keep original
-                msg["message"] = translated_text
-                msg["original_message"] = original_text
-            except Exception as e:
-                print(f"Translation error for message {i+1}: {e}")
-                msg["message"] = original_text
+    return _CJK_RE.search(text) is not None
+
+
+def open_translation_cache(path: str = CACHE_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the translation cache database."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS t (h BLOB PRIMARY KEY, en TEXT)")
+    return conn
+
+
+def _text_hash(text: str) -> bytes:
+    """Cache key for a source text."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+async def translate_messages(
+    messages: List[Dict],
+    api_key: str,
+    max_concurrency: int = MAX_CONCURRENCY,
+    cache_path: str = CACHE_PATH,
+    batch_size: int = BATCH_SIZE
+) -> List[Dict]:
+    """Translate messages from Chinese to English.
+    
+    Each distinct text is translated once, even if it appears in several
+    messages, and texts are packed batch_size per request. Requests are
+    issued concurrently (bounded by max_concurrency) so the total time is
+    dominated by the slowest requests rather than their sum. Translations
+    are cached in cache_path, so re-runs only pay for text that has not
+    been translated before.
+    """
+    # Only messages containing Chinese need translating
+    to_translate = [
+        msg for msg in messages
+        if msg.get("message") and has_chinese(msg["message"])
+    ]
+    unique_texts = list(dict.fromkeys(msg["message"] for msg in to_translate))
+    
+    # Serve cache hits directly
+    cache = open_translation_cache(cache_path)
+    translations: Dict[str, str] = {}
+    pending: List[str] = []
+    for text in unique_texts:
+        row = cache.execute("SELECT en FROM t WHERE h = ?", (_text_hash(text),)).fetchone()
+        if row:
+            translations[text] = row[0]
         else:
-            # Already in English or no Chinese characters
-            msg["message"] = original_text
-        
-        translated.append(msg)
+            pending.append(text)
+    
+    if translations:
+        print(f"Using {len(translations)} cached translations")
+    
+    client = AsyncOpenAI(api_key=api_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    completed = 0
+    
+    async def _bounded(batch: List[str]) -> List[str]:
+        nonlocal completed
+        async with semaphore:
+            translated_batch = await translate_with_openai(batch, client)
+        completed += len(batch)
+        print(f"  Progress: {completed}/{len(pending)}")
+        return translated_batch
     
-    return translated
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    print(f"Translating {len(pending)} unique texts from {len(to_translate)} of {len(messages)} messages "
+          f"in {len(batches)} requests...")
+    try:
+        batch_results = await asyncio.gather(*(_bounded(batch) for batch in batches))
+    finally:
+        await client.close()
+    results = [text for batch in batch_results for text in batch]
+    
+    new_entries = []
+    for text, translated_text in zip(pending, results):
+        translations[text] = translated_text
+        # translate_with_openai returns the source text on failure; don't cache that
+        if translated_text != text:
+            new_entries.append((_text_hash(text), translated_text))
+    
+    # Store all new translations in a single transaction
+    with cache:
+        cache.executemany("INSERT OR REPLACE INTO t (h, en) VALUES (?, ?)", new_entries)
+    cache.close()
+    
+    # Update messages with English translation, keep original
+    for msg in to_translate:
+        original_text = msg["message"]
+        msg["original_message"] = original_text
+        msg["message"] = translations[original_text]
+    
+    return messages
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the output JSON (default: compact, which is faster to write and read)"
+    )
+    args = parser.parse_args()
+    
     json_path = "dc_tracker.json"
     output_path = "dc_tracker.json"
     
@@ -108,19 +209,31 @@ def main():
         return
     
     print(f"Loading messages from {json_path}...")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        messages = json.load(f)
+    if HAS_ORJSON:
+        with open(json_path, 'rb') as f:
+            messages = orjson.loads(f.read())
+    else:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            messages = json.load(f)
     
     print(f"Loaded {len(messages)} messages")
     
     # Translate messages
     print("Translating messages to English...")
-    translated_messages = translate_messages(messages, api_key)
+    translated_messages = asyncio.run(translate_messages(messages, api_key))
     
     # Save translated messages
     print(f"Saving translated messages to {output_path}...")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(translated_messages, f, ensure_ascii=False, indent=2)
+    if HAS_ORJSON:
+        with open(output_path, 'wb') as f:
+            option = orjson.OPT_INDENT_2 if args.pretty else None
+            f.write(orjson.dumps(translated_messages, option=option))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            if args.pretty:
+                json.dump(translated_messages, f, ensure_ascii=False, indent=2)
+            else:
+                json.dump(translated_messages, f, ensure_ascii=False, separators=(',', ':'))
     
     print(f"\n✅ Successfully translated {len(translated_messages)} messages")
     print(f"Sample translated message:")
@@ -1,5 +1,13 @@
 """Trading action extraction modules."""
 
-from .llm_extractor import LLMExtractor
+from .llm_extractor import LLMExtractor, ExtractionUnavailableError
+from .semantic_cache import SemanticCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 
-__all__ = ["LLMExtractor"]
+__all__ = [
+    "LLMExtractor",
+    "ExtractionUnavailableError",
+    "SemanticCache",
+    "CircuitBreaker",
+    "CircuitOpenError",
+]
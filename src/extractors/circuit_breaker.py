@@ -0,0 +1,139 @@
+"""Circuit breaker that stops calling a failing LLM endpoint for a while."""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a call while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Fail fast while an endpoint is failing most of its calls.
+
+    Outcomes of recent calls are kept for a sliding window. When at least
+    min_calls were made in the window and more than failure_threshold of them
+    failed, the circuit opens and calls fail immediately for cooldown seconds.
+    After that one trial call is let through: success closes the circuit,
+    failure opens it again. before_call() says whether a call is the trial;
+    pass that on to record_success/record_failure/release, so calls that were
+    already in flight when the circuit opened cannot close it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window: float = 30.0,
+        cooldown: float = 60.0,
+        min_calls: int = 10
+    ):
+        """Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Failure ratio above which the circuit opens
+            window: Length of the sliding window in seconds
+            cooldown: Seconds to fail fast once the circuit is open
+            min_calls: Calls needed in the window before the ratio is acted on
+        """
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.min_calls = min_calls
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (time, failed)
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected."""
+        with self._lock:
+            return self._opened_at is not None and time.monotonic() - self._opened_at < self.cooldown
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until a call may be let through again (0 unless open)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(self.cooldown - (time.monotonic() - self._opened_at), 0.0)
+
+    def before_call(self) -> bool:
+        """Check that a call may be made.
+
+        Returns:
+            True if the call is the trial call of an open circuit
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            remaining = self.cooldown - (time.monotonic() - self._opened_at)
+            if remaining > 0 or self._trial_in_flight:
+                raise CircuitOpenError(
+                    f"LLM endpoint failing, skipping calls for {max(remaining, 0):.0f}s"
+                )
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self, trial: bool = False) -> None:
+        """Record a call that succeeded.
+
+        Args:
+            trial: What before_call() returned for the call
+        """
+        with self._lock:
+            if trial:
+                # Trial call succeeded: start over with a clean window
+                self._opened_at = None
+                self._trial_in_flight = False
+                self._outcomes.clear()
+                self._failures = 0
+            elif self._opened_at is None:
+                self._record(False)
+
+    def record_failure(self, trial: bool = False) -> None:
+        """Record a call that failed because of the endpoint.
+
+        Args:
+            trial: What before_call() returned for the call
+        """
+        with self._lock:
+            now = time.monotonic()
+            if trial:
+                # Trial call failed: stay open for another cooldown
+                self._opened_at = now
+                self._trial_in_flight = False
+                return
+            if self._opened_at is not None:
+                return
+            self._record(True)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and self._failures / len(self._outcomes) > self.failure_threshold
+            ):
+                self._opened_at = now
+
+    def release(self, trial: bool = False) -> None:
+        """End a call whose outcome says nothing about the endpoint (e.g. a bad request).
+
+        Args:
+            trial: What before_call() returned for the call
+        """
+        if trial:
+            with self._lock:
+                self._trial_in_flight = False
+
+    def _record(self, failed: bool) -> None:
+        """Add an outcome and drop the ones older than the window (lock held)."""
+        now = time.monotonic()
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        cutoff = now - self.window
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._failures -= self._outcomes.popleft()[1]
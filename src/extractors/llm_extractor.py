@@ -2,11 +2,15 @@
 
 import os
 import json
-from typing import List, Optional
+import re
+import sys
+import time
+from typing import Dict, List, Optional
 from datetime import datetime
 
 try:
-    from openai import OpenAI
+    import openai
+    from openai import OpenAI, AsyncOpenAI
     HAS_OPENAI = True
 except ImportError:
     HAS_OPENAI = False
@@ -17,18 +21,208 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
 from ..models.message import Message
 from ..models.trading_action import TradingAction, ActionType
+from .semantic_cache import SemanticCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+_SYSTEM_PROMPT = "You are a trading action extraction system. Return only valid JSON."
+
+# Instructions and few-shot examples shared by every extraction prompt. Kept
+# byte-for-byte static and placed before the message so that providers can
+# cache it as a prompt prefix (caching needs a prefix of at least 1024 tokens).
+# The instructions are the original ones; the examples beyond the first three
+# only apply them, so that the padding does not change what is extracted.
+_STATIC_PROMPT_PREFIX = """You are a trading action extraction system. Extract all trading actions (buy/sell) from the message given at the end of this prompt.
+
+Return a JSON array of trading actions. Each action should have:
+- action_type: "buy" or "sell" or "hold" or "unknown"
+- symbol: Stock symbol (e.g., "AAPL", "TSLA", "QQQ")
+- price: Price per share (float, optional)
+- quantity: Number of shares (integer, optional)
+- confidence: Confidence score 0.0-1.0
+- action_signal_time: The time when the signal was sent (extract from the message send time provided with the message, or from the message content if a specific time is mentioned). Format should match the message send time format if provided, otherwise use a standard format like "MM/DD/YYYY HH:MM AM/PM" or ISO format.
+
+If no trading action is found, return an empty array [].
+
+Examples:
+- Message send time: "10/5/2024 12:25 PM", "Buy 100 shares of AAPL at $150" -> {"action_type": "buy", "symbol": "AAPL", "price": 150.0, "quantity": 100, "confidence": 0.95, "action_signal_time": "10/5/2024 12:25 PM"}
+- Message send time: "10/10/2024 5:36 AM", "sell qqq 492 from 483" -> {"action_type": "sell", "symbol": "QQQ", "price": 492.0, "quantity": null, "confidence": 0.9, "action_signal_time": "10/10/2024 5:36 AM"}
+- "I'm thinking about buying TSLA" -> {"action_type": "unknown", "symbol": "TSLA", "price": null, "quantity": null, "confidence": 0.3, "action_signal_time": null}
+- Message send time: "10/11/2024 9:41 AM", "Added 50 NVDA here at 132.5" -> {"action_type": "buy", "symbol": "NVDA", "price": 132.5, "quantity": 50, "confidence": 0.9, "action_signal_time": "10/11/2024 9:41 AM"}
+- Message send time: "10/11/2024 10:15 AM", "Sold 200 shares of AMZN at 185.40" -> {"action_type": "sell", "symbol": "AMZN", "price": 185.4, "quantity": 200, "confidence": 0.95, "action_signal_time": "10/11/2024 10:15 AM"}
+- Message send time: "10/14/2024 9:31 AM", "buy spy 580" -> {"action_type": "buy", "symbol": "SPY", "price": 580.0, "quantity": null, "confidence": 0.9, "action_signal_time": "10/14/2024 9:31 AM"}
+- Message send time: "10/14/2024 11:47 AM", "Selling my remaining 30 shares of DIS at 95" -> {"action_type": "sell", "symbol": "DIS", "price": 95.0, "quantity": 30, "confidence": 0.95, "action_signal_time": "10/14/2024 11:47 AM"}
+- Message send time: "10/15/2024 10:02 AM", "Out of AMD at 160, rotating into SMCI at 38" -> [{"action_type": "sell", "symbol": "AMD", "price": 160.0, "quantity": null, "confidence": 0.9, "action_signal_time": "10/15/2024 10:02 AM"}, {"action_type": "buy", "symbol": "SMCI", "price": 38.0, "quantity": null, "confidence": 0.9, "action_signal_time": "10/15/2024 10:02 AM"}]
+- Message send time: "10/15/2024 1:20 PM", "Just bought 25 COIN at 210.5" -> {"action_type": "buy", "symbol": "COIN", "price": 210.5, "quantity": 25, "confidence": 0.95, "action_signal_time": "10/15/2024 1:20 PM"}
+- Message send time: "10/16/2024 3:55 PM", "Still holding my SPY calls into tomorrow" -> {"action_type": "hold", "symbol": "SPY", "price": null, "quantity": null, "confidence": 0.8, "action_signal_time": "10/16/2024 3:55 PM"}
+- Message send time: "10/17/2024 11:20 AM", "Market looks weak today, careful out there" -> []
+- Message send time: "10/17/2024 2:40 PM", "BUY 5 shares BRK.B @ 460" -> {"action_type": "buy", "symbol": "BRK.B", "price": 460.0, "quantity": 5, "confidence": 0.95, "action_signal_time": "10/17/2024 2:40 PM"}
+- Message send time: "10/18/2024 8:30 AM", "Bought 40 shares of AMZN at 185.2 at 9:35 yesterday" -> {"action_type": "buy", "symbol": "AMZN", "price": 185.2, "quantity": 40, "confidence": 0.85, "action_signal_time": "10/17/2024 9:35 AM"}
+- Message send time: "10/18/2024 10:05 AM", "sold all my PLTR at 42.10" -> {"action_type": "sell", "symbol": "PLTR", "price": 42.1, "quantity": null, "confidence": 0.9, "action_signal_time": "10/18/2024 10:05 AM"}
+- Message send time: "10/21/2024 9:50 AM", "Sold 15 META at 590, bought 20 GOOGL at 168" -> [{"action_type": "sell", "symbol": "META", "price": 590.0, "quantity": 15, "confidence": 0.95, "action_signal_time": "10/21/2024 9:50 AM"}, {"action_type": "buy", "symbol": "GOOGL", "price": 168.0, "quantity": 20, "confidence": 0.95, "action_signal_time": "10/21/2024 9:50 AM"}]
+- Message send time: "10/22/2024 3:10 PM", "Holding TSLA through earnings" -> {"action_type": "hold", "symbol": "TSLA", "price": null, "quantity": null, "confidence": 0.8, "action_signal_time": "10/22/2024 3:10 PM"}
+- Message send time: "10/23/2024 12:00 PM", "If GOOGL breaks 170 I might add some" -> {"action_type": "unknown", "symbol": "GOOGL", "price": 170.0, "quantity": null, "confidence": 0.35, "action_signal_time": "10/23/2024 12:00 PM"}
+- Message send time: "10/24/2024 8:02 AM", "gm everyone" -> []
+
+Return ONLY valid JSON, no other text."""
+
+# Everything in a single-message prompt before the message text
+_PROMPT_HEAD = _STATIC_PROMPT_PREFIX + "\n\nMessage:\n"
+
+# Appended to _STATIC_PROMPT_PREFIX when several messages share one request
+_PACKED_PROMPT_INSTRUCTIONS = """The message at the end is replaced by several numbered messages below. Extract the trading actions of each one separately, and return a JSON object mapping each message number (as a string) to that message's array of trading actions, e.g. {"1": [...], "2": []}. Include every number, using an empty array when a message has no trading action."""
+
+# API errors that mean the endpoint itself is struggling (rate limited, 5xx,
+# unreachable); only these count towards the circuit breaker
+_TRANSIENT_ERRORS: tuple = ()
+if HAS_OPENAI:
+    _TRANSIENT_ERRORS += (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+if HAS_ANTHROPIC:
+    _TRANSIENT_ERRORS += (anthropic.APIConnectionError, anthropic.RateLimitError, anthropic.InternalServerError)
+
+# Errors meaning no answer could be had right now; extract raises these as
+# ExtractionUnavailableError instead of reporting "no trading actions"
+_UNAVAILABLE_ERRORS = (CircuitOpenError,) + _TRANSIENT_ERRORS
+
+# Cheap screen run before the LLM. A message can only hold a trading action if
+# it has CJK text (always left to the LLM), a number or $, an action or entry
+# verb ("grabbed", "loaded up"), a ticker-like upper-case word, or a
+# capitalized word that may be a company name ("Apple", "Nvidia"); all-lower-case
+# chatter like "gm", "lol" or "🚀" has none. Misses cost trades and extra
+# matches only an LLM call, so when in doubt a message passes.
+_SCREEN_RE = re.compile(
+    r"[\u2e80-\u2fdf\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff]"
+    r"|[\d$]"
+    r"|(?i:\b(?:buy|sell|long|short|bought|sold|calls?|puts?|add(?:ed|ing)?|trim(?:med)?"
+    r"|hold(?:ing)?|cover(?:ed)?|exit(?:ed)?|entry|stop|profits?|shares?|contracts?|position"
+    r"|grab(?:bed|bing)?|load(?:ed|ing)?|scoop(?:ed|ing)?|picked|starter|open(?:ed|ing)?"
+    r"|clos(?:e|ed|ing)|enter(?:ed|ing)?|averag(?:e|ed|ing)|dump(?:ed|ing)?|bail(?:ed)?|took|cut)\b)"
+    r"|\b[A-Z]{2,5}\b"
+    r"|\b[A-Z][a-z]{2,}"
+)
+
+# Messages packed into one extraction request by extract_batch
+DEFAULT_PACK_SIZE = 16
+
+# Anthropic reply budget: MAX_TOKENS for one message; a packed request gets
+# PACKED_TOKENS_PER_MESSAGE per message, up to MAX_PACKED_TOKENS (the
+# smallest output limit among the Claude 3 models), so a full pack of 16
+# fits without its JSON being cut off
+MAX_TOKENS = 1000
+PACKED_TOKENS_PER_MESSAGE = 250
+MAX_PACKED_TOKENS = 4096
+
+# Opening fence of a reply wrapped in a markdown code block, e.g. ```json
+_FENCE_OPEN_RE = re.compile(r'```[A-Za-z]*')
+
+
+class ExtractionUnavailableError(Exception):
+    """Raised when the LLM provider cannot answer right now.
+    
+    Either the circuit breaker is open, or the call failed with a rate limit,
+    server or connection error after the SDK's own retries. The message was
+    not extracted, so it should be retried later rather than saved.
+    """
+    
+    def __init__(self, message: str, retry_after: float = 0.0, circuit_open: bool = False):
+        """Initialize error.
+        
+        Args:
+            message: Error description
+            retry_after: Seconds until the circuit breaker lets calls through again
+            circuit_open: Whether no call was made because the circuit was open
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.circuit_open = circuit_open
+
+
+# Connection pool settings for the API HTTP clients
+_HTTP_MAX_CONNECTIONS = 64
+_HTTP_MAX_KEEPALIVE = 32
+_HTTP_KEEPALIVE_EXPIRY = 300  # seconds
+_HTTP_TIMEOUT = 60.0
+_HTTP_CONNECT_TIMEOUT = 5.0
+
+
+def create_http_client(async_client: bool = False):
+    """Create a pooled HTTP client for the LLM API clients.
+    
+    Keeps up to 32 idle connections alive for 5 minutes so that repeated
+    extraction calls reuse TCP/TLS sessions instead of reconnecting. HTTP/2
+    is used when the h2 package is installed.
+    
+    Args:
+        async_client: Create an httpx.AsyncClient instead of an httpx.Client
+    
+    Returns:
+        httpx client, or None if httpx is not installed (the SDK default is used)
+    """
+    if not HAS_HTTPX:
+        return None
+    client_class = httpx.AsyncClient if async_client else httpx.Client
+    return client_class(
+        http2=HAS_H2,
+        limits=httpx.Limits(
+            max_connections=_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=_HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(_HTTP_TIMEOUT, connect=_HTTP_CONNECT_TIMEOUT)
+    )
+
+
+# Batch job states after which polling stops
+_OPENAI_BATCH_DONE = {"completed", "failed", "expired", "cancelled"}
 
 
 class LLMExtractor:
-    """Extract trading actions from messages using LLM."""
+    """Extract trading actions from messages using LLM.
+    
+    The extractor holds a pooled HTTP connection to the provider, so create one
+    and reuse it for every message rather than constructing one per call.
+    Call close() (or MessageProcessor.close()) when done.
+    
+    Rate-limited, 5xx and connection failures are retried by the provider SDK
+    with exponential backoff (max_retries times). If most calls still fail,
+    the circuit breaker opens and extraction fails fast instead of adding
+    load to an endpoint that is already struggling.
+    
+    With prescreen on, messages that cannot contain a trading action (no
+    ticker, company name, keyword, number or CJK text) get no actions
+    without an LLM call; screened_out counts them.
+    """
     
     def __init__(
         self,
         model: str = "gpt-4o-mini",
         provider: str = "openai",
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        cache: Optional[SemanticCache] = None,
+        http_client=None,
+        max_retries: Optional[int] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        prescreen: bool = True
     ):
         """Initialize LLM extractor.
         
@@ -36,6 +230,15 @@ class LLMExtractor:
             model: Model name (e.g., "gpt-4o-mini", "claude-3-opus-20240229")
             provider: LLM provider ("openai" or "anthropic")
             api_key: API key (if None, reads from environment)
+            cache: Response cache consulted before each LLM call (if None,
+                an exact-match SemanticCache is used)
+            http_client: httpx.Client to share between extractors (if None, a
+                pooled client owned by this extractor is created)
+            max_retries: Retries of failed API calls, with exponential backoff
+                (if None, the provider SDK's default)
+            circuit_breaker: Circuit breaker guarding API calls (if None, one
+                with default settings is used)
+            prescreen: Skip the LLM for messages with no possible trading signal
         """
         self.model = model
         self.provider = provider.lower()
@@ -57,13 +260,41 @@ class LLMExtractor:
         if self.provider == "openai":
             if not HAS_OPENAI:
                 raise ImportError("OpenAI library not installed. Install with: pip install openai")
-            self.client = OpenAI(api_key=self.api_key)
+            client_class = OpenAI
         elif self.provider == "anthropic":
             if not HAS_ANTHROPIC:
                 raise ImportError("Anthropic library not installed. Install with: pip install anthropic")
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            client_class = anthropic.Anthropic
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
+        
+        self._client_kwargs = {"api_key": self.api_key}
+        if max_retries is not None:
+            self._client_kwargs["max_retries"] = max_retries
+        
+        # A caller-supplied HTTP client is shared, so only close our own
+        self._owns_http_client = http_client is None
+        if http_client is None:
+            http_client = create_http_client()
+        if http_client is not None:
+            self.client = client_class(**self._client_kwargs, http_client=http_client)
+        else:
+            self.client = client_class(**self._client_kwargs)
+        
+        # Async client for aextract, created on first use
+        self._async_client = None
+        
+        self.cache = cache if cache is not None else SemanticCache()
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self.prescreen = prescreen
+        self.screened_out = 0
+        
+        # Request parts that are the same for every call
+        self._system_msg = {"role": "system", "content": _SYSTEM_PROMPT}
+        self._response_format = {"type": "json_object"} if "gpt-4" in self.model.lower() else None
+        self._prefix_block = {
+            "type": "text", "text": _STATIC_PROMPT_PREFIX, "cache_control": {"type": "ephemeral"}
+        }
     
     def extract(self, message: Message) -> List[TradingAction]:
         """Extract trading actions from a message.
@@ -73,89 +304,441 @@ class LLMExtractor:
         
         Returns:
             List of TradingAction objects (may be empty if no actions found)
+        
+        Raises:
+            ExtractionUnavailableError: If the provider cannot answer right now
         """
+        cached = self._lookup(message)
+        if cached is not None:
+            return cached
+        return self._extract_uncached(message)
+    
+    def _extract_uncached(self, message: Message) -> List[TradingAction]:
+        """Run extract() for a message that _lookup already missed."""
         prompt = self._create_extraction_prompt(message.message, send_time=message.send_time)
         
         try:
-            if self.provider == "openai":
-                response = self._extract_with_openai(prompt)
-            else:  # anthropic
-                response = self._extract_with_anthropic(prompt)
-            
+            response = self._complete(prompt)
             actions = self._parse_response(response, message)
-            return actions
+        except _UNAVAILABLE_ERRORS as e:
+            self.cache.discard(message)
+            raise self._unavailable_error(e) from e
         except Exception as e:
+            # Not cached: the same message gets a fresh try next time
+            self.cache.discard(message)
             print(f"Error extracting actions from message: {e}")
             return []
+        self.cache.store(message, actions)
+        return actions
+    
+    async def aextract(self, message: Message) -> List[TradingAction]:
+        """Async version of extract, for running many extractions concurrently.
+        
+        Args:
+            message: Message object to extract actions from
+        
+        Returns:
+            List of TradingAction objects (may be empty if no actions found)
+        
+        Raises:
+            ExtractionUnavailableError: If the provider cannot answer right now
+        """
+        cached = self._lookup(message)
+        if cached is not None:
+            return cached
+        
+        prompt = self._create_extraction_prompt(message.message, send_time=message.send_time)
+        
+        try:
+            response_text = await self._acomplete(prompt)
+            actions = self._parse_response(response_text, message)
+        except _UNAVAILABLE_ERRORS as e:
+            self.cache.discard(message)
+            raise self._unavailable_error(e) from e
+        except Exception as e:
+            # Not cached: the same message gets a fresh try next time
+            self.cache.discard(message)
+            print(f"Error extracting actions from message: {e}")
+            return []
+        self.cache.store(message, actions)
+        return actions
+    
+    def _unavailable_error(self, error: Exception) -> ExtractionUnavailableError:
+        """Wrap an error from _UNAVAILABLE_ERRORS for the caller."""
+        return ExtractionUnavailableError(
+            f"LLM provider unavailable: {error}",
+            retry_after=self.circuit_breaker.retry_after,
+            circuit_open=isinstance(error, CircuitOpenError)
+        )
+    
+    def _lookup(self, message: Message) -> Optional[List[TradingAction]]:
+        """Actions known without an LLM call: [] if screened out, else the cached result (or None)."""
+        if self.prescreen and not _SCREEN_RE.search(message.message):
+            self.screened_out += 1
+            return []
+        return self.cache.lookup(message)
+    
+    def close(self) -> None:
+        """Close the HTTP connection pool (unless it was supplied by the caller)."""
+        if self._owns_http_client:
+            self.client.close()
+    
+    async def aclose(self) -> None:
+        """Close the async client, if one was created."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+    
+    def _get_async_client(self):
+        """Get (creating on first use) the async API client."""
+        if self._async_client is None:
+            client_class = AsyncOpenAI if self.provider == "openai" else anthropic.AsyncAnthropic
+            http_client = create_http_client(async_client=True)
+            if http_client is not None:
+                self._async_client = client_class(**self._client_kwargs, http_client=http_client)
+            else:
+                self._async_client = client_class(**self._client_kwargs)
+        return self._async_client
+    
+    def batch_extract(
+        self,
+        messages: List[Message],
+        poll_interval: float = 30.0
+    ) -> Dict[int, List[TradingAction]]:
+        """Extract trading actions for many messages with the provider's Batch API.
+        
+        Batch jobs are billed at about half the real-time price and are not
+        rate limited like the chat endpoints, but may take up to 24 hours to
+        finish. Use for offline replays where latency does not matter. Blocks
+        until the job finishes.
+        
+        Args:
+            messages: Messages to extract actions from
+            poll_interval: Seconds between job status checks
+        
+        Returns:
+            Dict mapping each message's index in messages to its extracted
+            actions (empty if the request failed)
+        """
+        results = {}
+        pending = []  # indexes of messages that need a request
+        for i, message in enumerate(messages):
+            cached = self._lookup(message)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+        
+        if pending:
+            prompts = [
+                self._create_extraction_prompt(messages[i].message, send_time=messages[i].send_time)
+                for i in pending
+            ]
+            if self.provider == "openai":
+                responses = self._run_openai_batch(prompts, poll_interval)
+            else:  # anthropic
+                responses = self._run_anthropic_batch(prompts, poll_interval)
+            
+            for j, i in enumerate(pending):
+                try:
+                    results[i] = self._parse_response(responses[j], messages[i])
+                except Exception:
+                    # Failed request or unparseable reply: not cached
+                    self.cache.discard(messages[i])
+                    results[i] = []
+                else:
+                    self.cache.store(messages[i], results[i])
+        
+        return {i: results[i] for i in range(len(messages))}
+    
+    def _run_openai_batch(self, prompts: List[str], poll_interval: float) -> Dict[int, str]:
+        """Run prompts as an OpenAI batch job; returns prompt index -> response text."""
+        lines = []
+        for i, prompt in enumerate(prompts):
+            body = {k: v for k, v in self._openai_request(prompt).items() if v is not None}
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }, ensure_ascii=False))
+        
+        batch_file = self.client.files.create(
+            file=("extraction_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"Submitted batch {batch.id} with {len(prompts)} requests")
+        
+        while batch.status not in _OPENAI_BATCH_DONE:
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed":
+            print(f"Batch {batch.id} ended with status: {batch.status}")
+        if not batch.output_file_id:
+            return {}
+        
+        responses = {}
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                print(f"Batch request {result.get('custom_id')} failed: {result.get('error')}")
+                continue
+            responses[int(result["custom_id"])] = response["body"]["choices"][0]["message"]["content"]
+        return responses
+    
+    def _run_anthropic_batch(self, prompts: List[str], poll_interval: float) -> Dict[int, str]:
+        """Run prompts as an Anthropic message batch; returns prompt index -> response text."""
+        batch = self.client.messages.batches.create(
+            requests=[
+                {"custom_id": str(i), "params": self._anthropic_request(prompt)}
+                for i, prompt in enumerate(prompts)
+            ]
+        )
+        print(f"Submitted batch {batch.id} with {len(prompts)} requests")
+        
+        while batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+        
+        responses = {}
+        for entry in self.client.messages.batches.results(batch.id):
+            if entry.result.type != "succeeded":
+                print(f"Batch request {entry.custom_id} failed: {entry.result.type}")
+                continue
+            responses[int(entry.custom_id)] = entry.result.message.content[0].text
+        return responses
+    
+    def extract_batch(
+        self,
+        messages: List[Message],
+        pack_size: int = DEFAULT_PACK_SIZE
+    ) -> Dict[int, List[TradingAction]]:
+        """Extract trading actions for many messages, several per LLM request.
+        
+        Up to pack_size messages are numbered and sent in one prompt, so the
+        instructions are paid for once per request instead of once per
+        message. Messages that a packed reply leaves out (or whose request
+        fails) are retried one at a time, like extract() after its lookup.
+        
+        Args:
+            messages: Messages to extract actions from
+            pack_size: Maximum number of messages per request
+        
+        Returns:
+            Dict mapping each message's index in messages to its extracted actions
+        
+        Raises:
+            ExtractionUnavailableError: If the provider cannot answer right now
+        """
+        results = {}
+        pending = []  # indexes of messages that need a request
+        for i, message in enumerate(messages):
+            cached = self._lookup(message)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+        
+        for start in range(0, len(pending), pack_size):
+            chunk = pending[start:start + pack_size]
+            if len(chunk) == 1:
+                results[chunk[0]] = self._extract_uncached(messages[chunk[0]])
+                continue
+            
+            packed = self._extract_packed([messages[i] for i in chunk])
+            for k, i in enumerate(chunk):
+                if k in packed:
+                    results[i] = packed[k]
+                    self.cache.store(messages[i], packed[k])
+                else:
+                    results[i] = self._extract_uncached(messages[i])
+        
+        return {i: results[i] for i in range(len(messages))}
+    
+    def _extract_packed(self, messages: List[Message]) -> Dict[int, List[TradingAction]]:
+        """Send one packed request; returns position in messages -> actions for the answered ones."""
+        prompt = self._create_packed_prompt(messages)
+        max_tokens = min(MAX_PACKED_TOKENS, max(MAX_TOKENS, PACKED_TOKENS_PER_MESSAGE * len(messages)))
+        try:
+            data = self._load_json(self._complete(prompt, max_tokens))
+        except _UNAVAILABLE_ERRORS as e:
+            # Not a bad reply: retrying each message alone would fail the same way
+            raise self._unavailable_error(e) from e
+        except Exception as e:
+            print(f"Error extracting actions from {len(messages)} packed messages: {e}")
+            return {}
+        
+        if not isinstance(data, dict):
+            print(f"Unexpected packed response: {str(data)[:200]}")
+            return {}
+        
+        return {
+            k: self._actions_from_data(data[str(k + 1)], message)
+            for k, message in enumerate(messages)
+            if str(k + 1) in data
+        }
+    
+    def _create_packed_prompt(self, messages: List[Message]) -> str:
+        """Create one extraction prompt covering several numbered messages."""
+        numbered = []
+        for number, message in enumerate(messages, 1):
+            time_context = f"\nMessage send time: {message.send_time}" if message.send_time else ""
+            numbered.append(f"{number})\n{message.message}{time_context}")
+        return (
+            f"{_STATIC_PROMPT_PREFIX}\n\n{_PACKED_PROMPT_INSTRUCTIONS}\n\n"
+            f"Messages:\n" + "\n\n".join(numbered)
+        )
     
     def _create_extraction_prompt(self, message_text: str, send_time: str = None) -> str:
-        """Create prompt for LLM extraction."""
-        time_context = ""
+        """Create prompt for LLM extraction.
+        
+        The prompt starts with _STATIC_PROMPT_PREFIX, which is identical on
+        every call so the provider can serve it from its prompt cache; only the
+        message itself is appended after it.
+        """
         if send_time:
-            time_context = f"\nMessage send time: {send_time}"
+            return f"{_PROMPT_HEAD}{message_text}\nMessage send time: {send_time}"
+        return _PROMPT_HEAD + message_text
+    
+    def _openai_request(self, prompt: str) -> dict:
+        """Build chat.completions.create arguments for an extraction prompt."""
+        return {
+            "model": self.model,
+            "messages": [self._system_msg, {"role": "user", "content": prompt}],
+            "temperature": 0.1,
+            "response_format": self._response_format
+        }
+    
+    def _anthropic_request(self, prompt: str, max_tokens: int = MAX_TOKENS) -> dict:
+        """Build messages.create arguments for an extraction prompt.
         
-        return f"""You are a trading action extraction system. Extract all trading actions (buy/sell) from the following message.
-
-Message:
-{message_text}{time_context}
-
-Return a JSON array of trading actions. Each action should have:
-- action_type: "buy" or "sell" or "hold" or "unknown"
-- symbol: Stock symbol (e.g., "AAPL", "TSLA", "QQQ")
-- price: Price per share (float, optional)
-- quantity: Number of shares (integer, optional)
-- confidence: Confidence score 0.0-1.0
-- action_signal_time: The time when the signal was sent (extract from message send time provided above, or from the message content if a specific time is mentioned). Format should match the message send time format if provided, otherwise use a standard format like "MM/DD/YYYY HH:MM AM/PM" or ISO format.
-
-If no trading action is found, return an empty array [].
-
-Examples:
-- Message send time: "10/5/2024 12:25 PM", "Buy 100 shares of AAPL at $150" -> {{"action_type": "buy", "symbol": "AAPL", "price": 150.0, "quantity": 100, "confidence": 0.95, "action_signal_time": "10/5/2024 12:25 PM"}}
-- Message send time: "10/10/2024 5:36 AM", "sell qqq 492 from 483" -> {{"action_type": "sell", "symbol": "QQQ", "price": 492.0, "quantity": null, "confidence": 0.9, "action_signal_time": "10/10/2024 5:36 AM"}}
-- "I'm thinking about buying TSLA" -> {{"action_type": "unknown", "symbol": "TSLA", "price": null, "quantity": null, "confidence": 0.3, "action_signal_time": null}}
-
-Return ONLY valid JSON, no other text."""
+        The system prompt and the static prompt prefix are marked as a cache
+        breakpoint, so repeated calls only pay full price for the message.
+        """
+        if prompt.startswith(_STATIC_PROMPT_PREFIX):
+            content = [
+                self._prefix_block,
+                {"type": "text", "text": prompt[len(_STATIC_PROMPT_PREFIX):].lstrip("\n")}
+            ]
+        else:
+            content = prompt
+        return {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "system": _SYSTEM_PROMPT,
+            "messages": [
+                {"role": "user", "content": content}
+            ]
+        }
+    
+    def _complete(self, prompt: str, max_tokens: int = MAX_TOKENS) -> str:
+        """Send a prompt to the provider through the circuit breaker; returns the reply text.
+        
+        Args:
+            prompt: Extraction prompt
+            max_tokens: Reply length limit for Anthropic (OpenAI requests
+                leave it to the model's own limit)
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+        """
+        trial = self.circuit_breaker.before_call()
+        try:
+            if self.provider == "openai":
+                response = self._extract_with_openai(prompt)
+            else:  # anthropic
+                response = self._extract_with_anthropic(prompt, max_tokens)
+        except _TRANSIENT_ERRORS:
+            self.circuit_breaker.record_failure(trial)
+            raise
+        except BaseException:
+            # Bad request, cancellation, ...: not a sign of the endpoint failing
+            self.circuit_breaker.release(trial)
+            raise
+        self.circuit_breaker.record_success(trial)
+        return response
+    
+    async def _acomplete(self, prompt: str) -> str:
+        """Async version of _complete."""
+        # Created before before_call: if this raised after it, a trial call
+        # would be left in flight and the breaker would reject every later call
+        client = self._get_async_client()
+        trial = self.circuit_breaker.before_call()
+        try:
+            if self.provider == "openai":
+                response = await client.chat.completions.create(**self._openai_request(prompt))
+                response_text = response.choices[0].message.content
+            else:  # anthropic
+                response = await client.messages.create(**self._anthropic_request(prompt))
+                response_text = response.content[0].text
+        except _TRANSIENT_ERRORS:
+            self.circuit_breaker.record_failure(trial)
+            raise
+        except BaseException:
+            # Bad request, cancellation, ...: not a sign of the endpoint failing
+            self.circuit_breaker.release(trial)
+            raise
+        self.circuit_breaker.record_success(trial)
+        return response_text
     
     def _extract_with_openai(self, prompt: str) -> str:
         """Extract using OpenAI API."""
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a trading action extraction system. Return only valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            response_format={"type": "json_object"} if "gpt-4" in self.model.lower() else None
-        )
+        response = self.client.chat.completions.create(**self._openai_request(prompt))
         return response.choices[0].message.content
     
-    def _extract_with_anthropic(self, prompt: str) -> str:
+    def _extract_with_anthropic(self, prompt: str, max_tokens: int = MAX_TOKENS) -> str:
         """Extract using Anthropic API."""
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=1000,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+        response = self.client.messages.create(**self._anthropic_request(prompt, max_tokens))
         return response.content[0].text
     
     def _parse_response(self, response_text: str, message: Message) -> List[TradingAction]:
-        """Parse LLM response into TradingAction objects."""
+        """Parse LLM response into TradingAction objects.
+        
+        Raises:
+            ValueError: If the reply is not valid JSON (e.g. cut off), so the
+                caller does not mistake it for "no trading actions"
+        """
+        try:
+            data = self._load_json(response_text)
+        except json.JSONDecodeError as e:
+            print(f"Failed to parse JSON response: {e}")
+            print(f"Response was: {response_text.strip()[:200]}")
+            raise
+        except Exception as e:
+            print(f"Error parsing response: {e}")
+            raise ValueError(f"Unreadable response: {e}") from e
+        
+        return self._actions_from_data(data, message)
+    
+    @staticmethod
+    def _load_json(response_text: str):
+        """Parse the JSON in an LLM reply, ignoring a surrounding markdown code block."""
+        response_text = response_text.strip()
+        
+        # Remove markdown code blocks if present
+        if response_text.endswith("```"):
+            match = _FENCE_OPEN_RE.match(response_text)
+            if match and match.end() <= len(response_text) - 3:
+                response_text = response_text[match.end():-3].strip()
+        
+        # Parse JSON (orjson's JSONDecodeError subclasses json's)
+        return orjson.loads(response_text) if HAS_ORJSON else json.loads(response_text)
+    
+    def _actions_from_data(self, data, message: Message) -> List[TradingAction]:
+        """Convert parsed response JSON for one message into TradingAction objects."""
         actions = []
         
         try:
-            # Try to extract JSON from response
-            response_text = response_text.strip()
-            
-            # Remove markdown code blocks if present
-            if response_text.startswith("```"):
-                lines = response_text.split("\n")
-                response_text = "\n".join(lines[1:-1]) if len(lines) > 2 else response_text
-            
-            # Parse JSON
-            data = json.loads(response_text)
-            
             # Handle both single object and array responses
             if isinstance(data, dict):
                 # Single action
@@ -173,13 +756,10 @@ Return ONLY valid JSON, no other text."""
             # Convert to TradingAction objects
             for action_data in actions_data:
                 try:
-                    action_type_str = action_data.get("action_type", "unknown").lower()
-                    try:
-                        action_type = ActionType(action_type_str)
-                    except ValueError:
-                        action_type = ActionType.UNKNOWN
+                    action_type = ActionType.parse(action_data.get("action_type", "unknown"))
                     
-                    symbol = action_data.get("symbol", "").upper().strip()
+                    # Interned: the same few symbols recur across thousands of actions
+                    symbol = sys.intern(action_data.get("symbol", "").upper().strip())
                     if not symbol:
                         continue
                     
@@ -200,11 +780,7 @@ Return ONLY valid JSON, no other text."""
                     print(f"Error parsing action: {e}, data: {action_data}")
                     continue
                     
-        except json.JSONDecodeError as e:
-            print(f"Failed to parse JSON response: {e}")
-            print(f"Response was: {response_text[:200]}")
         except Exception as e:
             print(f"Error parsing response: {e}")
         
         return actions
-
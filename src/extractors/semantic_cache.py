@@ -0,0 +1,204 @@
+"""In-process cache of extraction results, keyed by message text.
+
+Crawled chat logs repeat themselves a lot (re-posted alerts, forwards, small
+edits), so the extractor checks this cache before calling the LLM. Exact
+repeats are served from a dict. Optionally, near-duplicates are matched by
+sentence-embedding cosine similarity (requires sentence-transformers; uses
+FAISS for the nearest-neighbour search when installed, numpy otherwise).
+"""
+
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    HAS_SENTENCE_TRANSFORMERS = True
+except ImportError:
+    HAS_SENTENCE_TRANSFORMERS = False
+
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
+from ..models.message import Message
+from ..models.trading_action import TradingAction
+
+
+# Cached entry: send time of the message it was extracted from, and its actions
+_Entry = Tuple[str, List[TradingAction]]
+
+# Embeddings kept between a missed lookup and its store (about one per
+# extraction in flight); older ones are dropped if a store never comes
+_MAX_PENDING = 1024
+
+
+class SemanticCache:
+    """Cache of extracted trading actions for previously seen messages.
+
+    Exact matches are kept for the max_size most recently used messages. The
+    semantic index stops taking new messages once it holds max_size.
+    """
+
+    def __init__(
+        self,
+        semantic: bool = False,
+        threshold: float = 0.92,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        max_size: int = 20000
+    ):
+        """Initialize the cache.
+
+        Args:
+            semantic: Also match near-duplicate messages by embedding similarity
+            threshold: Minimum cosine similarity for a semantic hit
+            model_name: sentence-transformers model used for embeddings
+            max_size: Maximum number of messages kept in each tier
+        """
+        if semantic and not (HAS_SENTENCE_TRANSFORMERS and HAS_NUMPY):
+            raise ImportError(
+                "Semantic caching requires sentence-transformers. "
+                "Install with: pip install sentence-transformers"
+            )
+
+        self.semantic = semantic
+        self.threshold = threshold
+        self.model_name = model_name
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._exact: "OrderedDict[str, _Entry]" = OrderedDict()  # least recently used first
+
+        # Semantic tier: loaded on first use
+        self._model = None
+        self._index = None  # faiss.IndexFlatIP, when FAISS is installed
+        self._vectors: List = []  # numpy fallback
+        self._matrix = None  # stacked _vectors, rebuilt after adds
+        self._entries: List[_Entry] = []
+        self._pending: "OrderedDict[str, np.ndarray]" = OrderedDict()  # embeddings computed by lookup, used by store
+
+    def lookup(self, message: Message) -> Optional[List[TradingAction]]:
+        """Get cached actions for a message.
+
+        Args:
+            message: Message about to be extracted
+
+        Returns:
+            Actions rebuilt for this message, or None on a cache miss
+        """
+        entry = self._exact.get(message.message)
+        if entry is not None:
+            self._exact.move_to_end(message.message)
+
+        if entry is None and self.semantic and message.message:
+            embedding = self._embed(message.message)
+            entry = self._nearest(embedding)
+            if entry is None:
+                self._pending[message.message] = embedding
+                if len(self._pending) > _MAX_PENDING:
+                    self._pending.popitem(last=False)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._rebuild(entry, message)
+
+    def store(self, message: Message, actions: List[TradingAction]) -> None:
+        """Cache the actions extracted from a message.
+
+        Args:
+            message: Message the actions were extracted from
+            actions: Extracted actions (may be empty)
+        """
+        if message.message in self._exact:
+            self._pending.pop(message.message, None)
+            return
+        entry = (message.send_time, list(actions))
+        self._exact[message.message] = entry
+        if len(self._exact) > self.max_size:
+            self._exact.popitem(last=False)
+
+        if self.semantic and message.message:
+            embedding = self._pending.pop(message.message, None)
+            if len(self._entries) < self.max_size:
+                if embedding is None:
+                    embedding = self._embed(message.message)
+                self._add(embedding, entry)
+
+    def discard(self, message: Message) -> None:
+        """Forget state kept from lookup for a message whose extraction failed.
+
+        Args:
+            message: Message that will not be stored
+        """
+        self._pending.pop(message.message, None)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def _rebuild(self, entry: _Entry, message: Message) -> List[TradingAction]:
+        """Copy cached actions, re-pointing them at the new message."""
+        cached_send_time, actions = entry
+        extracted_at = datetime.now().isoformat()
+        rebuilt = []
+        for action in actions:
+            # Signal times taken from the original message's send time follow the
+            # new message; times mentioned in the message text itself are kept.
+            signal_time = action.action_signal_time
+            if signal_time == cached_send_time:
+                signal_time = message.send_time
+            rebuilt.append(replace(
+                action,
+                raw_message=message.message,
+                extracted_at=extracted_at,
+                action_signal_time=signal_time
+            ))
+        return rebuilt
+
+    def _embed(self, text: str) -> "np.ndarray":
+        """Normalized float32 embedding of text."""
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name)
+        return np.asarray(
+            self._model.encode(text, normalize_embeddings=True), dtype=np.float32
+        )
+
+    def _nearest(self, embedding: "np.ndarray") -> Optional[_Entry]:
+        """Most similar cached entry, if it clears the threshold."""
+        if not self._entries:
+            return None
+
+        if self._index is not None:
+            scores, ids = self._index.search(embedding[None, :], 1)
+            score, best = float(scores[0][0]), int(ids[0][0])
+        else:
+            if self._matrix is None:
+                self._matrix = np.vstack(self._vectors)
+            similarities = self._matrix @ embedding
+            best = int(similarities.argmax())
+            score = float(similarities[best])
+
+        return self._entries[best] if score > self.threshold else None
+
+    def _add(self, embedding: "np.ndarray", entry: _Entry) -> None:
+        """Add an embedding to the semantic index."""
+        if HAS_FAISS:
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(embedding.shape[0])
+            self._index.add(embedding[None, :])
+        else:
+            self._vectors.append(embedding)
+            self._matrix = None
+        self._entries.append(entry)
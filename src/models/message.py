@@ -1,11 +1,45 @@
 """Message data model for representing messages from various platforms."""
 
+import re
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
+# Common formats: "10/5/2024 12:25 PM", "10/5/2024 12:25:00 PM"
+_TIME_FORMATS = [
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+]
 
-@dataclass
+# Shapes of the common formats, so only the matching one is tried
+_US_TIME_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}(:\d{2})? [AP]M")
+_ISO_TIME_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}(:\d{2})?")
+
+
+@lru_cache(maxsize=4096)
+def _parse_send_time(send_time: str) -> Optional[datetime]:
+    """Parse a send_time string; memoized since the same times recur across messages."""
+    match = _US_TIME_RE.fullmatch(send_time)
+    if match:
+        return datetime.strptime(send_time, _TIME_FORMATS[1] if match.group(1) else _TIME_FORMATS[0])
+    
+    if _ISO_TIME_RE.fullmatch(send_time):
+        # C-implemented and much faster than strptime for ISO dates
+        return datetime.fromisoformat(send_time)
+    
+    # Unusual spacing or case: let strptime's more lenient matching decide
+    for fmt in _TIME_FORMATS:
+        try:
+            return datetime.strptime(send_time, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass(slots=True)
 class Message:
     """Represents a message from a platform (Discord, Telegram, JSON file, etc.)."""
     
@@ -41,21 +75,7 @@ class Message:
     
     def parse_time(self) -> Optional[datetime]:
         """Attempt to parse send_time string into datetime object."""
-        # Common formats: "10/5/2024 12:25 PM", "10/5/2024 12:25:00 PM"
         try:
-            # Try common date formats
-            formats = [
-                "%m/%d/%Y %I:%M %p",
-                "%m/%d/%Y %I:%M:%S %p",
-                "%Y-%m-%d %H:%M:%S",
-                "%Y-%m-%d %H:%M",
-            ]
-            for fmt in formats:
-                try:
-                    return datetime.strptime(self.send_time, fmt)
-                except ValueError:
-                    continue
-            return None
+            return _parse_send_time(self.send_time)
         except Exception:
             return None
-
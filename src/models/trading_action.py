@@ -1,7 +1,8 @@
 """Trading action data model for extracted trading actions."""
 
+import sys
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional
 from enum import Enum
 
 
@@ -11,9 +12,18 @@ class ActionType(str, Enum):
     SELL = "sell"
     HOLD = "hold"
     UNKNOWN = "unknown"
+    
+    @classmethod
+    def parse(cls, value: str) -> "ActionType":
+        """Parse an action type string case-insensitively (UNKNOWN if unrecognized)."""
+        return _ACTION_MAP.get(value.lower(), ActionType.UNKNOWN)
+
+
+# Lookup table for ActionType.parse; avoids raising ValueError for unknown types
+_ACTION_MAP: Dict[str, ActionType] = {t.value: t for t in ActionType}
 
 
-@dataclass
+@dataclass(slots=True)
 class TradingAction:
     """Represents an extracted trading action from a message."""
     
@@ -44,15 +54,9 @@ class TradingAction:
     @classmethod
     def from_dict(cls, data: dict) -> "TradingAction":
         """Create TradingAction from dictionary."""
-        action_type_str = data.get("action_type", "unknown")
-        try:
-            action_type = ActionType(action_type_str.lower())
-        except ValueError:
-            action_type = ActionType.UNKNOWN
-        
         return cls(
-            action_type=action_type,
-            symbol=data.get("symbol", "").upper(),
+            action_type=ActionType.parse(data.get("action_type", "unknown")),
+            symbol=sys.intern(data.get("symbol", "").upper()),
             price=data.get("price"),
             quantity=data.get("quantity"),
             confidence=data.get("confidence", 0.0),
@@ -1,7 +1,7 @@
 """Abstract base class for platform adapters."""
 
 from abc import ABC, abstractmethod
-from typing import List, Callable, Optional
+from typing import Callable, Iterator, List, Optional
 from ..models.message import Message
 
 
@@ -38,6 +38,19 @@ class BasePlatformAdapter(ABC):
         """
         pass
     
+    def iter_messages(self) -> Iterator[Message]:
+        """Iterate over messages from the platform.
+        
+        The default implementation connects if needed and iterates over
+        get_messages(); adapters that can read lazily should override it.
+        
+        Yields:
+            Message objects
+        """
+        if not self.is_connected():
+            self.connect()
+        yield from self.get_messages()
+    
     @abstractmethod
     def listen(self, callback: Callable[[Message], None]) -> None:
         """Listen for new messages and call callback for each.
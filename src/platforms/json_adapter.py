@@ -1,8 +1,23 @@
 """JSON file adapter for reading messages from dc_tracker.json."""
 
 import json
+import mmap
 import os
-from typing import List, Callable, Optional
+from itertools import islice
+from typing import Callable, Iterator, List, Optional
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
 from .base import BasePlatformAdapter
 from ..models.message import Message
 
@@ -38,21 +53,10 @@ class JSONAdapter(BasePlatformAdapter):
             raise FileNotFoundError(f"JSON file not found: {self.json_path}")
         
         try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = self._load_file()
             
             # Convert JSON data to Message objects
-            self._messages = []
-            for item in data:
-                message = Message(
-                    sender=item.get("sender", ""),
-                    send_time=item.get("send_time", ""),
-                    message=item.get("message", ""),
-                    channel=None,  # JSON doesn't have channel info
-                    message_id=None,  # JSON doesn't have message IDs
-                    platform="json"
-                )
-                self._messages.append(message)
+            self._messages = [self._to_message(item) for item in data]
             
             self._connected = True
             self._current_index = 0
@@ -61,6 +65,69 @@ class JSONAdapter(BasePlatformAdapter):
         except Exception as e:
             raise ConnectionError(f"Failed to load JSON file: {e}")
     
+    def iter_messages(self) -> Iterator[Message]:
+        """Stream messages from the JSON file without loading it all.
+        
+        With ijson installed the file is parsed incrementally, so memory use
+        stays flat and the first messages are available before the whole file
+        has been read. Without ijson the file is parsed in one go.
+        
+        Yields:
+            Message objects in file order
+        """
+        if not os.path.exists(self.json_path):
+            raise FileNotFoundError(f"JSON file not found: {self.json_path}")
+        
+        if not HAS_IJSON:
+            for item in self._load_file():
+                yield self._to_message(item)
+            return
+        
+        with open(self.json_path, 'rb') as f:
+            try:
+                for item in ijson.items(f, 'item'):
+                    yield self._to_message(item)
+            except ijson.JSONError as e:
+                raise ValueError(f"Invalid JSON file: {e}")
+    
+    def _load_file(self) -> list:
+        """Parse the whole JSON file.
+        
+        With orjson the file is memory-mapped and parsed straight from the
+        mapping, so its contents are never copied into a bytes object and
+        peak memory is roughly the parsed messages alone.
+        
+        Returns:
+            Parsed JSON data
+        """
+        if not HAS_ORJSON:
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        
+        with open(self.json_path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return orjson.loads(f.read())
+        try:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+        finally:
+            mm.close()
+    
+    @staticmethod
+    def _to_message(item: dict) -> Message:
+        """Convert one JSON entry to a Message."""
+        return Message(
+            sender=item.get("sender", ""),
+            send_time=item.get("send_time", ""),
+            message=item.get("message", ""),
+            channel=None,  # JSON doesn't have channel info
+            message_id=None,  # JSON doesn't have message IDs
+            platform="json"
+        )
+    
     def disconnect(self) -> None:
         """Disconnect from JSON file."""
         self._connected = False
@@ -76,6 +143,10 @@ class JSONAdapter(BasePlatformAdapter):
         Returns:
             List of Message objects
         """
+        # Only the first `limit` entries are needed, so stream them rather than loading the file
+        if not self._connected and limit is not None:
+            return list(islice(self.iter_messages(), limit))
+        
         if not self._connected:
             self.connect()
         
@@ -93,11 +164,14 @@ class JSONAdapter(BasePlatformAdapter):
         Args:
             callback: Function to call with each message
         """
-        if not self._connected:
-            self.connect()
+        # Start from current index and process remaining messages; stream
+        # from the file if it has not been loaded
+        if self._connected:
+            messages = self._messages[self._current_index:]
+        else:
+            messages = islice(self.iter_messages(), self._current_index, None)
         
-        # Start from current index and process remaining messages
-        for message in self._messages[self._current_index:]:
+        for message in messages:
             callback(message)
             self._current_index += 1
     
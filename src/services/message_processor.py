@@ -1,14 +1,57 @@
 """Message processor service that orchestrates the extraction pipeline."""
 
-from typing import List, Optional, Callable
+import asyncio
+import time
+from itertools import islice
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple, TypeVar
 from ..platforms.base import BasePlatformAdapter
-from ..extractors.llm_extractor import LLMExtractor
+from ..extractors.llm_extractor import LLMExtractor, ExtractionUnavailableError, DEFAULT_PACK_SIZE
 from ..services.validator import ActionValidator
 from ..storage.database import Database
 from ..models.message import Message
 from ..models.trading_action import TradingAction
 
 
+# Default number of LLM extractions in flight for the async pipeline
+DEFAULT_MAX_CONCURRENCY = 16
+
+# Bound on messages waiting for extraction, and on results waiting to be written
+_QUEUE_SIZE = 1000
+
+# Most results the pipeline's writer saves in one go
+_WRITE_BATCH_SIZE = 1000
+
+# Failed LLM calls a message (or pack) gets while the provider is unavailable
+# before it is given up on; waits for an open circuit do not count
+_MAX_UNAVAILABLE_ATTEMPTS = 5
+
+# Shortest wait before retrying an extraction the provider could not answer
+_UNAVAILABLE_RETRY_WAIT = 1.0
+
+# Seconds without a single successful extraction after which the outage is
+# taken as sustained: remaining messages are given up on at their first
+# unavailable answer instead of each waiting out several cooldowns
+_MAX_OUTAGE = 300.0
+
+T = TypeVar("T")
+
+
+class _RateLimiter:
+    """Spaces out request start times to at most `rate` per second."""
+    
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_start = 0.0
+    
+    async def wait(self) -> None:
+        """Wait until the next request is allowed to start."""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start)
+        self._next_start = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
 class MessageProcessor:
     """Main service that orchestrates message processing, extraction, and storage."""
     
@@ -32,6 +75,10 @@ class MessageProcessor:
         self.validator = validator
         self.database = database
         self._on_action_extracted: Optional[Callable[[TradingAction], None]] = None
+        # Messages left unsaved because the LLM provider stayed unavailable
+        self.unavailable_skipped = 0
+        # When the provider became unavailable (monotonic time; None while it answers)
+        self._unavailable_since: Optional[float] = None
     
     def set_action_callback(self, callback: Callable[[TradingAction], None]) -> None:
         """Set callback for when actions are extracted.
@@ -51,59 +98,394 @@ class MessageProcessor:
             List of validated trading actions
         """
         # Extract actions from message
-        raw_actions = self.extractor.extract(message)
+        raw_actions = self._extract_when_available(lambda: self.extractor.extract(message), 1)
+        if raw_actions is None:
+            return []
+        return self._store_results(message, raw_actions)
+    
+    def _unavailable_retry_wait(self, error: ExtractionUnavailableError, failed_calls: int) -> Optional[float]:
+        """Seconds to wait before retrying after error, or None to give up."""
+        now = time.monotonic()
+        if self._unavailable_since is None:
+            self._unavailable_since = now
+        if now - self._unavailable_since >= _MAX_OUTAGE:
+            return None
+        if not error.circuit_open and failed_calls >= _MAX_UNAVAILABLE_ATTEMPTS:
+            return None
+        wait = max(error.retry_after, _UNAVAILABLE_RETRY_WAIT)
+        print(f"⏳ {error}; retrying in {wait:.0f}s")
+        return wait
+    
+    def _give_up(self, error: ExtractionUnavailableError, count: int) -> None:
+        """Report messages skipped (not saved) because the provider stayed unavailable."""
+        self.unavailable_skipped += count
+        print(f"❌ Skipping {count} message(s), not saved: {error}")
+    
+    def _extract_when_available(self, extract: Callable[[], T], count: int) -> Optional[T]:
+        """Run extract(), waiting out provider outages and retrying.
+        
+        An unavailable provider is never taken as "no trading actions": the
+        call is retried after the circuit breaker's cooldown. Messages whose
+        calls keep failing are given up on and left unsaved, and once nothing
+        has succeeded for _MAX_OUTAGE seconds every message still unavailable
+        is given up on without waiting.
+        
+        Args:
+            extract: Extraction call for count messages
+            count: Number of messages extract() covers
+        
+        Returns:
+            What extract() returned, or None if given up
+        """
+        failed_calls = 0
+        while True:
+            try:
+                result = extract()
+            except ExtractionUnavailableError as e:
+                failed_calls += not e.circuit_open
+                wait = self._unavailable_retry_wait(e, failed_calls)
+                if wait is None:
+                    self._give_up(e, count)
+                    return None
+                time.sleep(wait)
+            else:
+                self._unavailable_since = None
+                return result
+    
+    async def _aextract_when_available(self, extract: Callable[[], Awaitable[T]]) -> Optional[T]:
+        """Async version of _extract_when_available, for one message."""
+        failed_calls = 0
+        while True:
+            try:
+                result = await extract()
+            except ExtractionUnavailableError as e:
+                failed_calls += not e.circuit_open
+                wait = self._unavailable_retry_wait(e, failed_calls)
+                if wait is None:
+                    self._give_up(e, 1)
+                    return None
+                await asyncio.sleep(wait)
+            else:
+                self._unavailable_since = None
+                return result
+    
+    def _store_results(self, message: Message, raw_actions: List[TradingAction]) -> List[TradingAction]:
+        """Validate extracted actions, save them with their message, and fire callbacks.
+        
+        Args:
+            message: Message the actions were extracted from
+            raw_actions: Actions returned by the extractor
+        
+        Returns:
+            List of validated trading actions
+        """
+        return self._store_results_bulk([(message, raw_actions)])
+    
+    def _store_results_bulk(
+        self,
+        results: List[Tuple[Message, List[TradingAction]]]
+    ) -> List[TradingAction]:
+        """Validate and save many (message, actions) results in bulk.
+        
+        Messages and their actions are written in one transaction; callbacks
+        fire once it is committed.
+        
+        Args:
+            results: (message, extracted actions) pairs
+        
+        Returns:
+            List of all validated trading actions
+        """
+        all_actions = self._save_results_bulk(results)
+        self._fire_callbacks(all_actions)
+        return all_actions
+    
+    def _save_results_bulk(
+        self,
+        results: List[Tuple[Message, List[TradingAction]]]
+    ) -> List[TradingAction]:
+        """Validate and save results in one transaction, without firing callbacks.
+        
+        Args:
+            results: (message, extracted actions) pairs
+        
+        Returns:
+            List of all validated trading actions
+        """
+        if not results:
+            return []
         
         # Validate actions
-        valid_actions = self.validator.filter(raw_actions)
+        valid = [self.validator.filter(raw_actions) for _, raw_actions in results]
         
-        # Save message to database
-        message_db_id = self.database.save_message(message)
+        # Save messages and their actions together
+        self.database.save_results_bulk([
+            (message, actions) for (message, _), actions in zip(results, valid)
+        ])
         
-        # Save actions to database and trigger callbacks
-        for action in valid_actions:
-            self.database.save_trading_action(action, message_db_id)
-            
-            if self._on_action_extracted:
+        return [action for actions in valid for action in actions]
+    
+    def _fire_callbacks(self, actions: List[TradingAction]) -> None:
+        """Call the action callback, if set, for each saved action."""
+        if self._on_action_extracted:
+            for action in actions:
                 self._on_action_extracted(action)
-        
-        return valid_actions
     
-    def process_messages(self, messages: List[Message]) -> List[TradingAction]:
+    def process_messages(
+        self,
+        messages: Iterable[Message],
+        pack_size: int = DEFAULT_PACK_SIZE
+    ) -> List[TradingAction]:
         """Process multiple messages.
         
+        Messages are extracted pack_size at a time with one LLM request per
+        group (see LLMExtractor.extract_batch). Results are saved (and
+        callbacks fired) about every _WRITE_BATCH_SIZE messages.
+        
         Args:
-            messages: List of messages to process
+            messages: Messages to process
+            pack_size: Number of messages packed into each extraction request
         
         Returns:
             List of all validated trading actions
         """
         all_actions = []
+        pending = []  # results not yet saved
         
-        for message in messages:
-            actions = self.process_message(message)
-            all_actions.extend(actions)
+        messages = iter(messages)
+        while True:
+            chunk = list(islice(messages, pack_size))
+            if not chunk:
+                break
+            results = self._extract_when_available(
+                lambda: self.extractor.extract_batch(chunk, pack_size=pack_size), len(chunk)
+            )
+            if results is None:
+                continue
+            pending.extend((message, results[i]) for i, message in enumerate(chunk))
+            if len(pending) >= _WRITE_BATCH_SIZE:
+                all_actions.extend(self._store_results_bulk(pending))
+                pending = []
         
+        all_actions.extend(self._store_results_bulk(pending))
         return all_actions
     
-    def process_all(self, limit: Optional[int] = None) -> List[TradingAction]:
+    def process_all(
+        self,
+        limit: Optional[int] = None,
+        use_batch_api: bool = False
+    ) -> List[TradingAction]:
         """Process all messages from the platform adapter.
         
         Args:
             limit: Maximum number of messages to process (None for all)
+            use_batch_api: Extract through the provider's Batch API (cheaper,
+                but the job may take hours) instead of one request per message
         
         Returns:
             List of all validated trading actions
         """
-        # Connect to platform
-        if not self.platform_adapter.is_connected():
-            self.platform_adapter.connect()
+        # Stream messages from the platform
+        messages = islice(self.platform_adapter.iter_messages(), limit)
         
-        # Get messages
-        messages = self.platform_adapter.get_messages(limit=limit)
+        if use_batch_api:
+            messages = list(messages)
+            results = self.extractor.batch_extract(messages)
+            return self._store_results_bulk(
+                [(message, results[i]) for i, message in enumerate(messages)]
+            )
         
         # Process all messages
         return self.process_messages(messages)
     
+    async def aprocess_message(self, message: Message) -> List[TradingAction]:
+        """Async version of process_message.
+        
+        Args:
+            message: Message to process
+        
+        Returns:
+            List of validated trading actions
+        """
+        raw_actions = await self._aextract_when_available(lambda: self.extractor.aextract(message))
+        if raw_actions is None:
+            return []
+        return self._store_results(message, raw_actions)
+    
+    async def aprocess_messages(
+        self,
+        messages: Iterable[Message],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit: Optional[float] = None
+    ) -> List[TradingAction]:
+        """Process multiple messages with concurrent LLM extraction.
+        
+        Extraction is network-bound, so up to max_concurrency requests are kept
+        in flight at once. messages may be a lazy iterator (e.g. from
+        iter_messages()); requests start as soon as messages are read rather
+        than after the whole source is loaded. Results are saved after all
+        extractions finish, in message order.
+        
+        Args:
+            messages: Messages to process
+            max_concurrency: Maximum number of extractions in flight
+            rate_limit: Maximum extraction requests started per second (None for no limit)
+        
+        Returns:
+            List of all validated trading actions
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        limiter = _RateLimiter(rate_limit) if rate_limit else None
+        
+        async def _extract(message: Message) -> Optional[List[TradingAction]]:
+            try:
+                if limiter:
+                    await limiter.wait()
+                return await self._aextract_when_available(lambda: self.extractor.aextract(message))
+            finally:
+                semaphore.release()
+        
+        # Only read the next message once a slot is free, so a large source
+        # is never fully buffered ahead of the extractors
+        pending = []
+        tasks = []
+        for message in messages:
+            await semaphore.acquire()
+            pending.append(message)
+            tasks.append(asyncio.create_task(_extract(message)))
+            await asyncio.sleep(0)  # let the new request start
+        
+        results = await asyncio.gather(*tasks)
+        
+        # Write to the database once extraction is done (skipping given-up messages)
+        return self._store_results_bulk([
+            (message, actions) for message, actions in zip(pending, results) if actions is not None
+        ])
+    
+    async def aprocess_all(
+        self,
+        limit: Optional[int] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit: Optional[float] = None
+    ) -> List[TradingAction]:
+        """Async version of process_all, extracting messages concurrently.
+        
+        Messages are read, extracted and saved by separate stages of a queue
+        pipeline (see _arun_pipeline), so all three overlap.
+        
+        Args:
+            limit: Maximum number of messages to process (None for all)
+            max_concurrency: Maximum number of extractions in flight
+            rate_limit: Maximum extraction requests started per second (None for no limit)
+        
+        Returns:
+            List of all validated trading actions
+        """
+        def read_messages(enqueue: Callable[[Message], None]) -> None:
+            for message in islice(self.platform_adapter.iter_messages(), limit):
+                enqueue(message)
+        
+        return await self._arun_pipeline(read_messages, max_concurrency, rate_limit)
+    
+    async def astart_listening(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit: Optional[float] = None
+    ) -> List[TradingAction]:
+        """Async version of start_listening.
+        
+        The adapter's listen() runs in a thread and only enqueues messages, so
+        a slow LLM call never holds up reading the next message.
+        
+        Args:
+            max_concurrency: Maximum number of extractions in flight
+            rate_limit: Maximum extraction requests started per second (None for no limit)
+        
+        Returns:
+            List of all validated trading actions (once listen() returns)
+        """
+        if not self.platform_adapter.is_connected():
+            self.platform_adapter.connect()
+        
+        return await self._arun_pipeline(self.platform_adapter.listen, max_concurrency, rate_limit)
+    
+    async def _arun_pipeline(
+        self,
+        source: Callable[[Callable[[Message], None]], None],
+        max_concurrency: int,
+        rate_limit: Optional[float]
+    ) -> List[TradingAction]:
+        """Run producer -> extraction workers -> writer over bounded queues.
+        
+        source is called in a worker thread with an enqueue callback and
+        should call it once per message (e.g. an adapter's listen()). The
+        enqueue call blocks while the queue is full. max_concurrency worker
+        coroutines extract messages, and a single writer saves results in
+        batches as they complete (so actions are saved in completion order,
+        not message order). Each batch is written in a worker thread, so the
+        extraction workers keep running on the event loop during the write
+        and the results arriving meanwhile form the next batch. Callbacks
+        still run on the event loop.
+        
+        Returns:
+            List of all validated trading actions
+        """
+        loop = asyncio.get_running_loop()
+        messages: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        results: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        limiter = _RateLimiter(rate_limit) if rate_limit else None
+        all_actions = []
+        
+        def enqueue(message: Message) -> None:
+            asyncio.run_coroutine_threadsafe(messages.put(message), loop).result()
+        
+        async def producer() -> None:
+            try:
+                await asyncio.to_thread(source, enqueue)
+            finally:
+                # One stop marker per worker
+                for _ in range(max_concurrency):
+                    await messages.put(None)
+        
+        async def worker() -> None:
+            while True:
+                message = await messages.get()
+                if message is None:
+                    await results.put(None)
+                    return
+                if limiter:
+                    await limiter.wait()
+                actions = await self._aextract_when_available(lambda: self.extractor.aextract(message))
+                if actions is not None:
+                    await results.put((message, actions))
+        
+        async def writer() -> None:
+            running = max_concurrency
+            while running:
+                batch = [await results.get()]
+                while len(batch) < _WRITE_BATCH_SIZE and not results.empty():
+                    batch.append(results.get_nowait())
+                running -= batch.count(None)
+                actions = await asyncio.to_thread(
+                    self._save_results_bulk, [item for item in batch if item is not None]
+                )
+                self._fire_callbacks(actions)
+                all_actions.extend(actions)
+        
+        try:
+            await asyncio.gather(
+                producer(), *(worker() for _ in range(max_concurrency)), writer()
+            )
+        finally:
+            # The async client is bound to this event loop
+            await self.extractor.aclose()
+        
+        return all_actions
+    
+    def close(self) -> None:
+        """Release the extractor's HTTP connections."""
+        self.extractor.close()
+    
     def start_listening(self) -> None:
         """Start listening for new messages and process them automatically."""
         if not self.platform_adapter.is_connected():
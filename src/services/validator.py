@@ -1,9 +1,31 @@
 """Validator for trading actions."""
 
+from functools import lru_cache
 from typing import List
 from ..models.trading_action import TradingAction, ActionType
 
 
+@lru_cache(maxsize=4096)
+def _is_valid_symbol(symbol: str) -> bool:
+    """Check stock symbol format (see ActionValidator._is_valid_symbol).
+    
+    Cached because the same few hundred symbols recur across all actions.
+    """
+    if not symbol or len(symbol) < 1:
+        return False
+    
+    # Basic validation: 1-5 uppercase letters/numbers
+    # Common formats: AAPL, TSLA, QQQ, SPY, etc.
+    if len(symbol) > 10:  # Reasonable max length
+        return False
+    
+    # Should be alphanumeric
+    if not symbol.replace(".", "").isalnum():
+        return False
+    
+    return True
+
+
 class ActionValidator:
     """Validates and filters trading actions."""
     
@@ -55,7 +77,8 @@ class ActionValidator:
         Returns:
             Filtered list of valid actions
         """
-        return [action for action in actions if self.validate(action)]
+        validate = self.validate  # bound once, not per action
+        return [action for action in actions if validate(action)]
     
     def _is_valid_symbol(self, symbol: str) -> bool:
         """Check if stock symbol format is valid.
@@ -66,19 +89,7 @@ class ActionValidator:
         Returns:
             True if symbol format is valid
         """
-        if not symbol or len(symbol) < 1:
-            return False
-        
-        # Basic validation: 1-5 uppercase letters/numbers
-        # Common formats: AAPL, TSLA, QQQ, SPY, etc.
-        if len(symbol) > 10:  # Reasonable max length
-            return False
-        
-        # Should be alphanumeric
-        if not symbol.replace(".", "").isalnum():
-            return False
-        
-        return True
+        return _is_valid_symbol(symbol)
     
     def get_executable_actions(self, actions: List[TradingAction]) -> List[TradingAction]:
         """Get actions that are executable (buy/sell with sufficient confidence).
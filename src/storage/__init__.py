@@ -1,5 +1,6 @@
 """Database storage layer."""
 
 from .database import Database
+from .query_cache import QueryCache
 
-__all__ = ["Database"]
+__all__ = ["Database", "QueryCache"]
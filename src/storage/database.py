@@ -1,38 +1,422 @@
 """Database layer for storing messages and trading actions."""
 
+import queue
+import re
 import sqlite3
 import os
-from typing import List, Optional
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+from datetime import datetime, timedelta, timezone
 from ..models.message import Message
 from ..models.trading_action import TradingAction
+from .query_cache import QueryCache
+
+
+# Per-connection settings: NORMAL sync is safe with WAL (no fsync per commit),
+# and busy_timeout makes a writer wait for a concurrent one instead of failing
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",  # ~64 MB
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA busy_timeout=5000",
+)
+
+# Read-only connections kept open for reuse (more are opened when all are busy)
+_READ_POOL_SIZE = 4
+
+# Summary tables for get_action_statistics, kept current by the triggers below
+# so statistics never need a scan of trading_actions
+_STATS_TABLES_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS action_stats (
+        key TEXT PRIMARY KEY,
+        value REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS action_type_counts (
+        action_type TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS symbol_counts (
+        symbol TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    )
+    """,
+)
+
+# Counts for existing databases created before the summary tables
+_STATS_BACKFILL_SQL = (
+    """
+    INSERT INTO action_stats (key, value)
+    SELECT 'total', COUNT(*) FROM trading_actions
+    UNION ALL
+    SELECT 'confidence_sum', COALESCE(SUM(confidence), 0.0) FROM trading_actions
+    """,
+    """
+    INSERT INTO action_type_counts (action_type, count)
+    SELECT action_type, COUNT(*) FROM trading_actions GROUP BY action_type
+    """,
+    """
+    INSERT INTO symbol_counts (symbol, count)
+    SELECT symbol, COUNT(*) FROM trading_actions GROUP BY symbol
+    """,
+)
+
+# Count a row in (+1) or out (-1 and drop counts that reach zero)
+_STATS_ADD = """
+        UPDATE action_stats SET value = value + 1 WHERE key = 'total';
+        UPDATE action_stats SET value = value + NEW.confidence WHERE key = 'confidence_sum';
+        INSERT INTO action_type_counts (action_type, count) VALUES (NEW.action_type, 1)
+            ON CONFLICT(action_type) DO UPDATE SET count = count + 1;
+        INSERT INTO symbol_counts (symbol, count) VALUES (NEW.symbol, 1)
+            ON CONFLICT(symbol) DO UPDATE SET count = count + 1;
+"""
+_STATS_REMOVE = """
+        UPDATE action_stats SET value = value - 1 WHERE key = 'total';
+        UPDATE action_stats SET value = value - OLD.confidence WHERE key = 'confidence_sum';
+        UPDATE action_type_counts SET count = count - 1 WHERE action_type = OLD.action_type;
+        DELETE FROM action_type_counts WHERE action_type = OLD.action_type AND count <= 0;
+        UPDATE symbol_counts SET count = count - 1 WHERE symbol = OLD.symbol;
+        DELETE FROM symbol_counts WHERE symbol = OLD.symbol AND count <= 0;
+"""
+_STATS_TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trading_actions_stats_insert
+    AFTER INSERT ON trading_actions
+    BEGIN{_STATS_ADD}    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trading_actions_stats_delete
+    AFTER DELETE ON trading_actions
+    BEGIN{_STATS_REMOVE}    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trading_actions_stats_update
+    AFTER UPDATE OF action_type, symbol, confidence ON trading_actions
+    BEGIN{_STATS_REMOVE}{_STATS_ADD}    END
+    """,
+)
+
+# Count of every row written to messages or trading_actions (kept in
+# action_stats), so readers such as the labeling export can tell whether the
+# data changed since they last looked without reading it all
+_CHANGE_COUNTER_SQL = """
+    INSERT OR IGNORE INTO action_stats (key, value) VALUES ('changes', 0)
+"""
+_CHANGE_COUNTER_TRIGGERS_SQL = tuple(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_{event.lower()}
+    AFTER {event} ON {table}
+    BEGIN
+        UPDATE action_stats SET value = value + 1 WHERE key = 'changes';
+    END
+    """
+    for table in ("messages", "trading_actions")
+    for event in ("INSERT", "UPDATE", "DELETE")
+)
+
+# Optional full-text index over message sender and text, kept in sync by
+# triggers. The trigram tokenizer matches any substring of 3+ characters,
+# which also works for Chinese text (the default tokenizer would index a CJK
+# run as one word), at about three times the size of the messages table
+_MESSAGES_FTS_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts
+    USING fts5(sender, message, content='messages', content_rowid='id', tokenize='trigram')
+"""
+_MESSAGES_FTS_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_messages_fts_insert
+    AFTER INSERT ON messages
+    BEGIN
+        INSERT INTO messages_fts (rowid, sender, message) VALUES (NEW.id, NEW.sender, NEW.message);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_messages_fts_delete
+    AFTER DELETE ON messages
+    BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, sender, message)
+        VALUES ('delete', OLD.id, OLD.sender, OLD.message);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_messages_fts_update
+    AFTER UPDATE OF sender, message ON messages
+    BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, sender, message)
+        VALUES ('delete', OLD.id, OLD.sender, OLD.message);
+        INSERT INTO messages_fts (rowid, sender, message) VALUES (NEW.id, NEW.sender, NEW.message);
+    END
+    """,
+)
+
+# Shortest query the trigram index can answer
+_FTS_MIN_QUERY_LENGTH = 3
+
+_RECENT_ACTIONS_SQL = """
+    SELECT ta.*, us_to_iso(ta.extracted_at_us) AS extracted_at, m.sender, m.send_time, m.message
+    FROM trading_actions ta
+    LEFT JOIN messages m ON ta.message_id = m.id
+    WHERE ta.confidence >= ?{action_type_filter}
+    ORDER BY ta.extracted_at_us DESC
+    LIMIT ?
+"""
+
+# _RECENT_ACTIONS_SQL without and with an action type condition
+_RECENT_ACTIONS_ALL_SQL = _RECENT_ACTIONS_SQL.format(action_type_filter="")
+_RECENT_ACTIONS_BY_TYPE_SQL = _RECENT_ACTIONS_SQL.format(action_type_filter=" AND ta.action_type = ?")
+
+# A message already stored (same platform and message_id) is left as it is;
+# the no-op update makes RETURNING give its id instead of no row
+_INSERT_MESSAGE_SQL = """
+    INSERT INTO messages (sender, send_time, message, channel, message_id, platform)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(platform, message_id) DO UPDATE SET message_id = excluded.message_id
+    RETURNING id
+"""
+
+_INSERT_ACTION_SQL = """
+    INSERT INTO trading_actions 
+    (message_id, action_type, symbol, price, quantity, confidence, raw_message, extracted_at_us, action_signal_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+# Extraction times are stored as INTEGER microseconds since the unix epoch:
+# 8-byte keys that sort numerically, instead of ~26-character ISO strings
+_TRADING_ACTIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        message_id INTEGER,
+        action_type TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        price REAL,
+        quantity INTEGER,
+        confidence REAL NOT NULL,
+        raw_message TEXT,
+        extracted_at_us INTEGER DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000000 AS INTEGER)),
+        action_signal_time TEXT,
+        FOREIGN KEY (message_id) REFERENCES messages(id),
+        CHECK (confidence >= 0.0 AND confidence <= 1.0)
+    )
+"""
+
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _iso_to_us(value: Optional[str]) -> Optional[int]:
+    """Convert an ISO timestamp (naive means local time) to unix microseconds."""
+    if value is None:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    return (dt - _UNIX_EPOCH) // timedelta(microseconds=1)
+
+
+# SQLite's CURRENT_TIMESTAMP format, the default of the old TEXT extracted_at column
+_SQLITE_TIMESTAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+
+def _legacy_iso_to_us(value: Optional[str]) -> Optional[int]:
+    """Convert an old TEXT extracted_at value to unix microseconds.
+    
+    Values in CURRENT_TIMESTAMP format came from the column default and are
+    UTC; the others were written by datetime.now().isoformat() and are local.
+    """
+    if isinstance(value, str) and _SQLITE_TIMESTAMP_RE.fullmatch(value):
+        value += "+00:00"
+    return _iso_to_us(value)
+
+
+def _us_to_iso(value: Optional[int]) -> Optional[str]:
+    """Convert unix microseconds to a naive local ISO timestamp."""
+    if value is None:
+        return None
+    dt = _UNIX_EPOCH + timedelta(microseconds=value)
+    return dt.astimezone().replace(tzinfo=None).isoformat()
+
+
+def _message_row(message: Message) -> tuple:
+    """Parameters for _INSERT_MESSAGE_SQL."""
+    return (
+        message.sender,
+        message.send_time,
+        message.message,
+        message.channel,
+        message.message_id,
+        message.platform
+    )
+
+
+def _action_row(action: TradingAction, message_db_id: Optional[int]) -> tuple:
+    """Parameters for _INSERT_ACTION_SQL."""
+    extracted_at = action.extracted_at or datetime.now().isoformat()
+    return (
+        message_db_id,
+        action.action_type.value,
+        action.symbol,
+        action.price,
+        action.quantity,
+        action.confidence,
+        action.raw_message,
+        _iso_to_us(extracted_at),
+        action.action_signal_time
+    )
 
 
 class Database:
-    """SQLite database for storing messages and trading actions."""
+    """SQLite database for storing messages and trading actions.
     
-    def __init__(self, db_path: str = "./data/trading_actions.db"):
+    Writes go through one long-lived connection, serialized by a lock; reads
+    use a small pool of read-only connections, which in WAL mode run
+    alongside the writer. The instance can be shared between threads. Call
+    close() when done.
+    
+    Query results are cached for cache_ttl seconds and dropped on every
+    write through this instance, so rows written by another process show up
+    once the TTL expires.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "./data/trading_actions.db",
+        cache_ttl: float = 10.0,
+        full_text_search: bool = False
+    ):
         """Initialize database connection.
         
         Args:
             db_path: Path to SQLite database file
+            cache_ttl: Seconds query results are cached (0 disables caching)
+            full_text_search: Build the message search index if the database
+                does not have one yet (an existing index is always used and
+                kept current); without it search_messages scans with LIKE
         """
         self.db_path = db_path
+        self.full_text_search = full_text_search
         # Ensure data directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        self._writer = self._get_connection()
+        self._write_lock = threading.Lock()
+        # An in-memory database exists only in the writer connection, so reads use it too
+        self._readers = None if db_path == ":memory:" else queue.Queue(maxsize=_READ_POOL_SIZE)
+        self._query_cache = QueryCache(ttl=cache_ttl)
         self._init_schema()
     
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
+    def _get_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a new database connection.
+        
+        Connections are in autocommit mode (isolation_level=None): the sqlite3
+        module issues no BEGIN/COMMIT of its own, transactions are opened
+        explicitly by _write_conn.
+        """
+        if read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        # Queries convert stored microseconds back to ISO strings with us_to_iso
+        conn.create_function("iso_to_us", 1, _iso_to_us, deterministic=True)
+        conn.create_function("us_to_iso", 1, _us_to_iso, deterministic=True)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
     
+    @contextmanager
+    def _write_conn(self) -> Iterator[sqlite3.Connection]:
+        """Use the writer connection in one transaction (committed on success).
+        
+        BEGIN IMMEDIATE takes SQLite's write lock up front, so a concurrent
+        writer in another process makes this wait (busy_timeout) at the start
+        rather than fail partway through the transaction.
+        """
+        try:
+            with self._write_lock:
+                self._writer.execute("BEGIN IMMEDIATE")
+                try:
+                    yield self._writer
+                except BaseException:
+                    # SQLite may already have rolled back (e.g. disk full)
+                    if self._writer.in_transaction:
+                        self._writer.execute("ROLLBACK")
+                    raise
+                try:
+                    self._writer.execute("COMMIT")
+                except BaseException:
+                    # A failed COMMIT (e.g. SQLITE_BUSY, I/O error) leaves the
+                    # transaction open, and every later BEGIN would fail
+                    if self._writer.in_transaction:
+                        self._writer.execute("ROLLBACK")
+                    raise
+        finally:
+            self._query_cache.clear()
+    
+    @contextmanager
+    def _read_conn(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool."""
+        if self._readers is None:
+            with self._write_lock:
+                yield self._writer
+            return
+        
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._get_connection(read_only=True)
+        try:
+            yield conn
+        finally:
+            try:
+                self._readers.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
+    def close(self) -> None:
+        """Close all connections."""
+        if self._readers is not None:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+        self._writer.close()
+    
     def _init_schema(self) -> None:
         """Initialize database schema."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
+        # WAL lets the dashboard read while the crawler writes; the mode is
+        # stored in the database file, so setting it once here is enough
+        # (it cannot be changed inside a transaction)
+        if self.db_path != ":memory:":
+            self._writer.execute("PRAGMA journal_mode=WAL")
+        
+        # One transaction, so no insert can slip in between backfilling the
+        # summary tables and creating the triggers that maintain them
+        with self._write_conn() as conn:
+            self._create_schema(conn.cursor())
+    
+    def _create_schema(self, cursor: sqlite3.Cursor) -> None:
+        """Create tables and indexes that do not exist yet."""
         # Messages table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS messages (
@@ -49,22 +433,7 @@ class Database:
         """)
         
         # Trading actions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS trading_actions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                message_id INTEGER,
-                action_type TEXT NOT NULL,
-                symbol TEXT NOT NULL,
-                price REAL,
-                quantity INTEGER,
-                confidence REAL NOT NULL,
-                raw_message TEXT,
-                extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                action_signal_time TEXT,
-                FOREIGN KEY (message_id) REFERENCES messages(id),
-                CHECK (confidence >= 0.0 AND confidence <= 1.0)
-            )
-        """)
+        cursor.execute(_TRADING_ACTIONS_TABLE_SQL.format(table="trading_actions"))
         
         # Add action_signal_time column if it doesn't exist (for existing databases)
         try:
@@ -73,30 +442,74 @@ class Database:
             # Column already exists, ignore
             pass
         
-        # Create indexes for better query performance
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_messages_sender 
-            ON messages(sender)
-        """)
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_messages_send_time 
-            ON messages(send_time)
-        """)
+        # Existing databases store extracted_at as TEXT: rebuild the table with
+        # the INTEGER column (its indexes and triggers are recreated below)
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(trading_actions)")}
+        if "extracted_at" in columns:
+            cursor.connection.create_function("legacy_iso_to_us", 1, _legacy_iso_to_us, deterministic=True)
+            cursor.execute(_TRADING_ACTIONS_TABLE_SQL.format(table="trading_actions_new"))
+            cursor.execute("""
+                INSERT INTO trading_actions_new
+                (id, message_id, action_type, symbol, price, quantity, confidence,
+                 raw_message, extracted_at_us, action_signal_time)
+                SELECT id, message_id, action_type, symbol, price, quantity, confidence,
+                       raw_message, legacy_iso_to_us(extracted_at), action_signal_time
+                FROM trading_actions
+            """)
+            cursor.execute("DROP TABLE trading_actions")
+            cursor.execute("ALTER TABLE trading_actions_new RENAME TO trading_actions")
+        
+        # Create indexes for better query performance (only ones a query uses:
+        # every index is one more B-tree to update on each insert)
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trading_actions_symbol 
-            ON trading_actions(symbol)
+            CREATE INDEX IF NOT EXISTS idx_trading_actions_message_id 
+            ON trading_actions(message_id)
         """)
+        # get_recent_actions walks this newest first and checks confidence in
+        # the index, reading table rows only for actions it returns
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trading_actions_confidence 
-            ON trading_actions(confidence)
+            CREATE INDEX IF NOT EXISTS idx_trading_actions_extracted_at_us_confidence 
+            ON trading_actions(extracted_at_us, confidence)
         """)
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trading_actions_extracted_at 
-            ON trading_actions(extracted_at)
-        """)
-        
-        conn.commit()
-        conn.close()
+        # Indexes of earlier versions that no query reads (statistics come
+        # from the summary tables, recent messages in rowid order)
+        for index in (
+            "idx_messages_sender",
+            "idx_messages_send_time",
+            "idx_trading_actions_symbol",
+            "idx_trading_actions_confidence",
+        ):
+            cursor.execute(f"DROP INDEX IF EXISTS {index}")
+        
+        # Statistics summary tables (filled from existing rows when first created)
+        for sql in _STATS_TABLES_SQL:
+            cursor.execute(sql)
+        if cursor.execute("SELECT 1 FROM action_stats WHERE key = 'total'").fetchone() is None:
+            for sql in _STATS_BACKFILL_SQL:
+                cursor.execute(sql)
+        for sql in _STATS_TRIGGERS_SQL:
+            cursor.execute(sql)
+        cursor.execute(_CHANGE_COUNTER_SQL)
+        for sql in _CHANGE_COUNTER_TRIGGERS_SQL:
+            cursor.execute(sql)
+        
+        # Message search index, only built when asked for (filled from existing
+        # rows when first created); without it, or without FTS5 in this SQLite
+        # build, search_messages falls back to LIKE
+        has_fts = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'"
+        ).fetchone() is not None
+        if not has_fts and self.full_text_search:
+            try:
+                cursor.execute(_MESSAGES_FTS_SQL)
+                cursor.execute("INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')")
+                has_fts = True
+            except sqlite3.OperationalError:
+                pass
+        if has_fts:
+            for sql in _MESSAGES_FTS_TRIGGERS_SQL:
+                cursor.execute(sql)
+        self._has_fts = has_fts
     
     def save_message(self, message: Message) -> int:
         """Save a message to the database.
@@ -105,28 +518,30 @@ class Database:
             message: Message object to save
         
         Returns:
-            Database ID of saved message
+            Database ID of saved message (the existing row's ID if the
+            message was already stored)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO messages (sender, send_time, message, channel, message_id, platform)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            message.sender,
-            message.send_time,
-            message.message,
-            message.channel,
-            message.message_id,
-            message.platform
-        ))
-        
-        message_db_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._write_conn() as conn:
+            message_db_id = conn.execute(_INSERT_MESSAGE_SQL, _message_row(message)).fetchone()[0]
         return message_db_id
     
+    def save_messages_bulk(self, messages: Sequence[Message]) -> List[int]:
+        """Save many messages in a single transaction.
+        
+        Args:
+            messages: Message objects to save
+        
+        Returns:
+            Database IDs of the saved messages, in the same order
+        """
+        with self._write_conn() as conn:
+            cursor = conn.cursor()
+            # Row by row for the returned IDs; the single commit is what saves the time
+            message_db_ids = []
+            for message in messages:
+                message_db_ids.append(cursor.execute(_INSERT_MESSAGE_SQL, _message_row(message)).fetchone()[0])
+        return message_db_ids
+    
     def save_trading_action(self, action: TradingAction, message_db_id: Optional[int] = None) -> int:
         """Save a trading action to the database.
         
@@ -137,31 +552,47 @@ class Database:
         Returns:
             Database ID of saved trading action
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._write_conn() as conn:
+            action_db_id = conn.execute(_INSERT_ACTION_SQL, _action_row(action, message_db_id)).lastrowid
+        return action_db_id
+    
+    def save_trading_actions_bulk(
+        self,
+        actions: Sequence[Tuple[TradingAction, Optional[int]]]
+    ) -> None:
+        """Save many trading actions in a single transaction.
         
-        extracted_at = action.extracted_at or datetime.now().isoformat()
+        Args:
+            actions: (action, message_db_id) pairs, as for save_trading_action
+        """
+        with self._write_conn() as conn:
+            conn.executemany(
+                _INSERT_ACTION_SQL,
+                [_action_row(action, message_db_id) for action, message_db_id in actions]
+            )
+    
+    def save_results_bulk(
+        self,
+        results: Sequence[Tuple[Message, Sequence[TradingAction]]]
+    ) -> List[int]:
+        """Save messages together with their trading actions in one transaction.
         
-        cursor.execute("""
-            INSERT INTO trading_actions 
-            (message_id, action_type, symbol, price, quantity, confidence, raw_message, extracted_at, action_signal_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            message_db_id,
-            action.action_type.value,
-            action.symbol,
-            action.price,
-            action.quantity,
-            action.confidence,
-            action.raw_message,
-            extracted_at,
-            action.action_signal_time
-        ))
-        
-        action_db_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return action_db_id
+        Args:
+            results: (message, actions) pairs; each action is linked to its message
+        
+        Returns:
+            Database IDs of the saved messages, in the same order
+        """
+        with self._write_conn() as conn:
+            cursor = conn.cursor()
+            message_db_ids = []
+            action_rows = []
+            for message, actions in results:
+                message_db_id = cursor.execute(_INSERT_MESSAGE_SQL, _message_row(message)).fetchone()[0]
+                message_db_ids.append(message_db_id)
+                action_rows.extend(_action_row(action, message_db_id) for action in actions)
+            cursor.executemany(_INSERT_ACTION_SQL, action_rows)
+        return message_db_ids
     
     def get_recent_messages(self, limit: int = 100) -> List[dict]:
         """Get recent messages from database.
@@ -172,46 +603,137 @@ class Database:
         Returns:
             List of message dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        key = ("recent_messages", limit)
+        rows = self._query_cache.get(key)
+        if rows is None:
+            # Newest by rowid: same order as created_at (set on insert), but
+            # read straight off the table's B-tree instead of sorting every message
+            with self._read_conn() as conn:
+                rows = tuple(conn.execute("""
+                    SELECT * FROM messages 
+                    ORDER BY id DESC 
+                    LIMIT ?
+                """, (limit,)))
+            self._query_cache.put(key, rows)
+        # The cache holds the (immutable) rows; each caller gets its own dicts
+        return [dict(row) for row in rows]
+    
+    @staticmethod
+    def _recent_actions_query(
+        limit: int,
+        min_confidence: float,
+        action_type: Optional[str]
+    ) -> Tuple[str, tuple]:
+        """SQL and parameters for the recent actions queries."""
+        if action_type is None:
+            return _RECENT_ACTIONS_ALL_SQL, (min_confidence, limit)
+        return _RECENT_ACTIONS_BY_TYPE_SQL, (min_confidence, action_type, limit)
+    
+    def search_messages(self, query: str, limit: int = 100) -> List[dict]:
+        """Find messages whose sender or text contains query, newest first.
         
-        cursor.execute("""
-            SELECT * FROM messages 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        """, (limit,))
+        Uses the full-text index when the database has one (see
+        full_text_search) and the query has 3+ characters, a LIKE scan
+        otherwise.
         
-        rows = cursor.fetchall()
-        conn.close()
+        Args:
+            query: Text to look for (matched as a substring, case-insensitively)
+            limit: Maximum number of messages to retrieve
         
+        Returns:
+            List of message dictionaries
+        """
+        key = ("search_messages", query, limit)
+        rows = self._query_cache.get(key)
+        if rows is not None:
+            return [dict(row) for row in rows]
+        
+        if self._has_fts and len(query) >= _FTS_MIN_QUERY_LENGTH:
+            # Quoted as one FTS5 string, so the query's own characters are not syntax
+            # FTS5 walks its matches in descending rowid order itself, so the
+            # limit applies before the join instead of after sorting every match
+            sql = """
+                SELECT m.* FROM (
+                    SELECT rowid FROM messages_fts
+                    WHERE messages_fts MATCH ?
+                    ORDER BY rowid DESC
+                    LIMIT ?
+                ) f
+                JOIN messages m ON m.id = f.rowid
+                ORDER BY m.id DESC
+            """
+            params = ('"' + query.replace('"', '""') + '"', limit)
+        else:
+            sql = """
+                SELECT * FROM messages
+                WHERE sender LIKE ? ESCAPE '\\' OR message LIKE ? ESCAPE '\\'
+                ORDER BY id DESC
+                LIMIT ?
+            """
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            params = (pattern, pattern, limit)
+        
+        with self._read_conn() as conn:
+            rows = tuple(conn.execute(sql, params))
+        
+        self._query_cache.put(key, rows)
         return [dict(row) for row in rows]
     
-    def get_recent_actions(self, limit: int = 100, min_confidence: float = 0.0) -> List[dict]:
+    def get_recent_actions(
+        self,
+        limit: int = 100,
+        min_confidence: float = 0.0,
+        action_type: Optional[str] = None
+    ) -> List[dict]:
         """Get recent trading actions from database.
         
         Args:
             limit: Maximum number of actions to retrieve
             min_confidence: Minimum confidence threshold
+            action_type: Only actions of this type (e.g. "buy"); None for all
         
         Returns:
             List of trading action dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        key = ("recent_actions", limit, min_confidence, action_type)
+        rows = self._query_cache.get(key)
+        if rows is None:
+            with self._read_conn() as conn:
+                rows = tuple(conn.execute(*self._recent_actions_query(limit, min_confidence, action_type)))
+            self._query_cache.put(key, rows)
+        # The cache holds the (immutable) rows; each caller gets its own dicts
+        return [dict(row) for row in rows]
+    
+    def get_recent_actions_df(
+        self,
+        limit: int = 100,
+        min_confidence: float = 0.0,
+        action_type: Optional[str] = None
+    ) -> "pd.DataFrame":
+        """Get recent trading actions as a DataFrame (one column per field).
         
-        cursor.execute("""
-            SELECT ta.*, m.sender, m.send_time, m.message
-            FROM trading_actions ta
-            LEFT JOIN messages m ON ta.message_id = m.id
-            WHERE ta.confidence >= ?
-            ORDER BY ta.extracted_at DESC
-            LIMIT ?
-        """, (min_confidence, limit))
+        Same rows as get_recent_actions, without building a dict per row.
         
-        rows = cursor.fetchall()
-        conn.close()
+        Args:
+            limit: Maximum number of actions to retrieve
+            min_confidence: Minimum confidence threshold
+            action_type: Only actions of this type (e.g. "buy"); None for all
         
-        return [dict(row) for row in rows]
+        Returns:
+            DataFrame of trading actions
+        """
+        if not HAS_PANDAS:
+            raise ImportError("pandas not installed. Install with: pip install pandas")
+        
+        key = ("recent_actions_df", limit, min_confidence, action_type)
+        cached = self._query_cache.get(key)
+        if cached is None:
+            sql, params = self._recent_actions_query(limit, min_confidence, action_type)
+            with self._read_conn() as conn:
+                cached = pd.read_sql_query(sql, conn, params=params)
+            self._query_cache.put(key, cached)
+        # Copy, so callers can add or change columns without touching the cache
+        return cached.copy()
     
     def get_action_statistics(self) -> dict:
         """Get statistics about trading actions.
@@ -219,36 +741,35 @@ class Database:
         Returns:
             Dictionary with statistics
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Total actions
-        cursor.execute("SELECT COUNT(*) FROM trading_actions")
-        total = cursor.fetchone()[0]
-        
-        # Actions by type
-        cursor.execute("""
-            SELECT action_type, COUNT(*) as count 
-            FROM trading_actions 
-            GROUP BY action_type
-        """)
-        by_type = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Average confidence
-        cursor.execute("SELECT AVG(confidence) FROM trading_actions")
-        avg_confidence = cursor.fetchone()[0] or 0.0
-        
-        # Actions by symbol (top 10)
-        cursor.execute("""
-            SELECT symbol, COUNT(*) as count 
-            FROM trading_actions 
-            GROUP BY symbol 
-            ORDER BY count DESC 
-            LIMIT 10
-        """)
-        top_symbols = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        conn.close()
+        cached = self._query_cache.get("statistics")
+        if cached is None:
+            cached = self._query_statistics()
+            self._query_cache.put("statistics", cached)
+        # Copy, so callers can change the result without touching the cache
+        return {
+            **cached,
+            "by_type": dict(cached["by_type"]),
+            "top_symbols": dict(cached["top_symbols"])
+        }
+    
+    def _query_statistics(self) -> dict:
+        """Read get_action_statistics' result from the summary tables."""
+        with self._read_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Totals
+            cursor.execute("SELECT key, value FROM action_stats")
+            totals = dict(cursor.fetchall())
+            total = int(totals.get("total", 0))
+            avg_confidence = totals.get("confidence_sum", 0.0) / total if total else 0.0
+            
+            # Actions by type
+            cursor.execute("SELECT action_type, count FROM action_type_counts ORDER BY action_type")
+            by_type = {row[0]: row[1] for row in cursor.fetchall()}
+            
+            # Actions by symbol (top 10)
+            cursor.execute("SELECT symbol, count FROM symbol_counts ORDER BY count DESC LIMIT 10")
+            top_symbols = {row[0]: row[1] for row in cursor.fetchall()}
         
         return {
             "total_actions": total,
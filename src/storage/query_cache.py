@@ -0,0 +1,58 @@
+"""Small in-process cache for database query results."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class QueryCache:
+    """LRU cache whose entries expire after ttl seconds.
+
+    Used by Database to serve repeated queries without touching SQLite.
+    Cached results are shared between callers, so Database stores immutable
+    rows (or copies what it hands out).
+    """
+
+    def __init__(self, max_size: int = 128, ttl: float = 10.0):
+        """Initialize query cache.
+
+        Args:
+            max_size: Maximum number of cached results
+            ttl: Seconds a result stays valid (0 disables caching)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached result, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """Cache a result, evicting the least recently used one if full."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
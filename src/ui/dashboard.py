@@ -4,7 +4,71 @@ import streamlit as st
 import pandas as pd
 from typing import Optional
 from ..storage.database import Database
-from ..models.trading_action import ActionType
+
+# Seconds a dashboard query result is reused across reruns
+_CACHE_TTL = 10
+
+
+# The leading underscore keeps Streamlit from hashing the Database argument
+@st.cache_data(ttl=_CACHE_TTL)
+def _load_statistics(_db: Database) -> dict:
+    """Action statistics, cached across reruns."""
+    return _db.get_action_statistics()
+
+
+@st.cache_data(ttl=_CACHE_TTL)
+def _load_recent_actions(
+    _db: Database,
+    limit: int,
+    min_confidence: float,
+    action_type: Optional[str]
+) -> pd.DataFrame:
+    """Recent trading actions, cached across reruns per filter setting."""
+    return _db.get_recent_actions_df(limit=limit, min_confidence=min_confidence, action_type=action_type)
+
+
+@st.cache_data(ttl=_CACHE_TTL)
+def _load_recent_messages(_db: Database, limit: int) -> list:
+    """Recent messages, cached across reruns."""
+    return _db.get_recent_messages(limit=limit)
+
+
+@st.cache_data(ttl=_CACHE_TTL)
+def _search_messages(_db: Database, query: str, limit: int) -> list:
+    """Messages matching a search query, cached across reruns."""
+    return _db.search_messages(query, limit=limit)
+
+
+def _format_quantity(quantity) -> object:
+    """Display value for a quantity: "N/A" if missing or 0, whole numbers as int.
+    
+    The column comes back as float whenever it holds NULLs, so 10 arrives as
+    10.0; fractional quantities such as 1.5 are shown as they are.
+    """
+    if pd.isna(quantity) or quantity == 0:
+        return "N/A"
+    return int(quantity) if float(quantity).is_integer() else quantity
+
+
+def _format_actions(actions: pd.DataFrame) -> pd.DataFrame:
+    """Build the display table for the Recent Trading Actions section."""
+    # An all-NULL price column comes back as object dtype holding None
+    price = pd.to_numeric(actions["price"], errors="coerce")
+    message = actions["message"].fillna("")
+    preview = message.str[:100]
+    return pd.DataFrame({
+        "Time": actions["extracted_at"].fillna("").str[:19],
+        "Action": actions["action_type"].str.upper(),
+        "Symbol": actions["symbol"],
+        "Price": price.map("${:.2f}".format, na_action="ignore").where(price.notna() & (price != 0), "N/A"),
+        # Built as object values: Series.map would turn whole numbers back into floats
+        "Quantity": pd.Series(
+            [_format_quantity(q) for q in actions["quantity"]], index=actions.index, dtype=object
+        ),
+        "Confidence": (actions["confidence"] * 100).map("{:.1f}%".format),
+        "Sender": actions["sender"].fillna(""),
+        "Message": preview.where(message.str.len() <= 100, preview + "...")
+    })
 
 
 def render_dashboard(db: Database):
@@ -45,7 +109,7 @@ def render_dashboard(db: Database):
     )
     
     # Statistics
-    stats = db.get_action_statistics()
+    stats = _load_statistics(db)
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -62,41 +126,30 @@ def render_dashboard(db: Database):
     # Recent Trading Actions
     st.header("Recent Trading Actions")
     
-    actions = db.get_recent_actions(limit=limit, min_confidence=min_confidence)
+    # Filter by action type in the query, so the limit counts matching actions only
+    action_type = action_type_filter.lower() if action_type_filter != "All" else None
+    actions = _load_recent_actions(db, limit, min_confidence, action_type)
     
-    # Filter by action type
-    if action_type_filter != "All":
-        actions = [
-            a for a in actions
-            if a.get("action_type", "").lower() == action_type_filter.lower()
-        ]
-    
-    if actions:
-        # Prepare data for display
-        df_data = []
-        for action in actions:
-            df_data.append({
-                "Time": action.get("extracted_at", "")[:19] if action.get("extracted_at") else "",
-                "Action": action.get("action_type", "").upper(),
-                "Symbol": action.get("symbol", ""),
-                "Price": f"${action.get('price', 0):.2f}" if action.get("price") else "N/A",
-                "Quantity": action.get("quantity") or "N/A",
-                "Confidence": f"{action.get('confidence', 0):.1%}",
-                "Sender": action.get("sender", ""),
-                "Message": action.get("message", "")[:100] + "..." if len(action.get("message", "")) > 100 else action.get("message", "")
-            })
-        
-        df = pd.DataFrame(df_data)
-        st.dataframe(df, use_container_width=True, hide_index=True)
+    if not actions.empty:
+        st.dataframe(_format_actions(actions), use_container_width=True, hide_index=True)
     else:
         st.info("No trading actions found with the current filters.")
     
     # Recent Messages
     with st.expander("Recent Messages"):
-        messages = db.get_recent_messages(limit=50)
+        query = st.text_input("Search messages", placeholder="Sender or text, e.g. NVDA")
+        if query:
+            messages = _search_messages(db, query, 50)
+        else:
+            messages = _load_recent_messages(db, 10)
         if messages:
-            for msg in messages[:10]:  # Show first 10
-                st.text(f"[{msg.get('send_time', '')}] {msg.get('sender', '')}: {msg.get('message', '')[:200]}")
+            # One text element for all lines rather than one per message
+            st.text("\n".join(
+                f"[{msg['send_time']}] {msg['sender']}: {(msg['message'] or '')[:200]}"
+                for msg in messages
+            ))
+        elif query:
+            st.info("No messages match the search.")
         else:
             st.info("No messages in database.")
     
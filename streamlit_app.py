@@ -7,12 +7,24 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+import streamlit as st
+
 from src.storage.database import Database
 from src.ui.dashboard import render_dashboard
 
-# Initialize database
-db = Database()
+
+# Streamlit reruns this script on every interaction; cache_resource keeps one
+# Database (and its connections) for all reruns and sessions instead
+@st.cache_resource
+def get_db() -> Database:
+    """Database shared by all dashboard sessions.
+
+    Its own query cache is off: the dashboard caches results with
+    st.cache_data, and a second TTL underneath would double the staleness.
+    """
+    return Database(cache_ttl=0)
+
 
 # Render dashboard
-render_dashboard(db)
+render_dashboard(get_db())
 
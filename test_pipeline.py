@@ -76,6 +76,7 @@ def test_pipeline():
     print(f"      Statistics: {stats}")
     
     # Cleanup
+    db.close()
     os.remove("./data/test_pipeline.db")
     
     print("\n✅ All tests passed!")
@@ -0,0 +1,105 @@
+"""Unit tests for the LLM endpoint circuit breaker."""
+
+import unittest
+from unittest import mock
+
+from src.extractors.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test circuit breaker state transitions."""
+    
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("src.extractors.circuit_breaker.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=0.5, window=30.0, cooldown=60.0, min_calls=4)
+    
+    def _open(self):
+        """Fail enough calls to open the circuit."""
+        for _ in range(4):
+            self.assertFalse(self.breaker.before_call())
+            self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open)
+    
+    def test_stays_closed_below_min_calls_or_threshold(self):
+        """Test failures only open the circuit once min_calls were made and most failed."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.assertFalse(self.breaker.is_open)  # 3 calls, below min_calls
+        
+        breaker = CircuitBreaker(failure_threshold=0.5, window=30.0, cooldown=60.0, min_calls=4)
+        for failed in (False, False, True, False, True):
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        self.assertFalse(breaker.is_open)  # 2 of 5 failed
+        self.assertEqual(breaker.retry_after, 0.0)
+    
+    def test_old_outcomes_leave_the_window(self):
+        """Test failures older than the window no longer count."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.now += 31.0
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.is_open)
+    
+    def test_opens_and_rejects_calls(self):
+        """Test an open circuit rejects calls and reports the remaining cooldown."""
+        self._open()
+        self.assertEqual(self.breaker.retry_after, 60.0)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.now += 45.0
+        self.assertEqual(self.breaker.retry_after, 15.0)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+    
+    def test_trial_success_closes(self):
+        """Test one trial call is let through after the cooldown and its success closes the circuit."""
+        self._open()
+        self.now += 60.0
+        self.assertEqual(self.breaker.retry_after, 0.0)
+        self.assertTrue(self.breaker.before_call())
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()  # only one trial at a time
+        self.breaker.record_success(trial=True)
+        self.assertFalse(self.breaker.is_open)
+        self.assertFalse(self.breaker.before_call())
+        self.assertEqual(self.breaker.retry_after, 0.0)
+    
+    def test_trial_failure_reopens(self):
+        """Test a failed trial call starts another full cooldown."""
+        self._open()
+        self.now += 60.0
+        self.assertTrue(self.breaker.before_call())
+        self.breaker.record_failure(trial=True)
+        self.assertTrue(self.breaker.is_open)
+        self.assertEqual(self.breaker.retry_after, 60.0)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+    
+    def test_release_frees_the_trial(self):
+        """Test a trial call that says nothing about the endpoint lets another trial through."""
+        self._open()
+        self.now += 60.0
+        self.assertTrue(self.breaker.before_call())
+        self.breaker.release(trial=True)
+        self.assertTrue(self.breaker.before_call())
+    
+    def test_calls_in_flight_when_opened_cannot_close(self):
+        """Test only the trial call's outcome changes an open circuit."""
+        self._open()
+        self.breaker.record_success()  # a call started before the circuit opened
+        self.assertTrue(self.breaker.is_open)
+        self.now += 60.0
+        self.assertTrue(self.breaker.before_call())
+        self.breaker.record_failure()  # another late non-trial outcome
+        self.breaker.record_success(trial=True)
+        self.assertFalse(self.breaker.is_open)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Unit tests for the dashboard's table formatting."""
+
+import unittest
+
+import pandas as pd
+
+try:
+    from src.ui.dashboard import _format_actions
+    HAS_STREAMLIT = True
+except ImportError:
+    HAS_STREAMLIT = False
+
+
+def _actions(**columns) -> pd.DataFrame:
+    """Rows shaped like Database.get_recent_actions_df, one per list entry."""
+    size = len(next(iter(columns.values())))
+    rows = {
+        "extracted_at": ["2024-10-14T09:30:00.123456"] * size,
+        "action_type": ["hold"] * size,
+        "symbol": ["SPY"] * size,
+        "price": [None] * size,
+        "quantity": [None] * size,
+        "confidence": [0.8] * size,
+        "sender": ["trader"] * size,
+        "message": ["Still holding SPY"] * size,
+    }
+    rows.update(columns)
+    return pd.DataFrame(rows)
+
+
+@unittest.skipUnless(HAS_STREAMLIT, "streamlit not installed")
+class TestFormatActions(unittest.TestCase):
+    """Test the Recent Trading Actions display table."""
+    
+    def test_all_prices_missing(self):
+        """Test a page with no prices shows N/A (the column is object dtype of None)."""
+        table = _format_actions(_actions(symbol=["SPY", "QQQ"]))
+        self.assertEqual(list(table["Price"]), ["N/A", "N/A"])
+        self.assertEqual(list(table["Quantity"]), ["N/A", "N/A"])
+    
+    def test_prices_and_quantities(self):
+        """Test present values are formatted and missing or zero ones show N/A."""
+        table = _format_actions(_actions(
+            price=[150.0, None, 0.0],
+            quantity=[100.0, 1.5, None]
+        ))
+        self.assertEqual(list(table["Price"]), ["$150.00", "N/A", "N/A"])
+        self.assertEqual(list(table["Quantity"]), [100, 1.5, "N/A"])
+        self.assertEqual(list(table["Action"]), ["HOLD"] * 3)
+        self.assertEqual(list(table["Confidence"]), ["80.0%"] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+"""Unit tests for the SQLite storage layer."""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+
+from src.models.message import Message
+from src.models.trading_action import TradingAction, ActionType
+from src.storage.database import Database, _iso_to_us, _us_to_iso
+
+
+# Schema of databases created before extraction times were stored as integers
+_BASELINE_SCHEMA_SQL = """
+    CREATE TABLE messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sender TEXT NOT NULL,
+        send_time TEXT NOT NULL,
+        message TEXT NOT NULL,
+        channel TEXT,
+        message_id TEXT,
+        platform TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(platform, message_id) ON CONFLICT IGNORE
+    );
+    CREATE TABLE trading_actions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        message_id INTEGER,
+        action_type TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        price REAL,
+        quantity INTEGER,
+        confidence REAL NOT NULL,
+        raw_message TEXT,
+        extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        action_signal_time TEXT,
+        FOREIGN KEY (message_id) REFERENCES messages(id),
+        CHECK (confidence >= 0.0 AND confidence <= 1.0)
+    );
+    CREATE INDEX idx_trading_actions_extracted_at ON trading_actions(extracted_at);
+"""
+
+
+class TestDatabaseMigration(unittest.TestCase):
+    """Test upgrading databases written by earlier versions."""
+    
+    def setUp(self):
+        # A zone away from UTC, so local and UTC readings of a naive time differ
+        self._tz = os.environ.get("TZ")
+        os.environ["TZ"] = "America/New_York"
+        if hasattr(time, "tzset"):
+            time.tzset()
+        self._dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._dir.name, "baseline.db")
+    
+    def tearDown(self):
+        if self._tz is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = self._tz
+        if hasattr(time, "tzset"):
+            time.tzset()
+        self._dir.cleanup()
+    
+    def test_iso_round_trip(self):
+        """Test naive local timestamps survive conversion to microseconds and back."""
+        for value in ("2024-10-14T09:30:00", "2024-10-14T09:30:00.123456", "2024-01-02T23:59:59.000001"):
+            self.assertEqual(_us_to_iso(_iso_to_us(value)), value)
+        self.assertEqual(
+            _iso_to_us("2024-10-14T13:30:00+00:00"),
+            _iso_to_us("2024-10-14T09:30:00")  # New York is UTC-4 in October
+        )
+        self.assertIsNone(_iso_to_us(None))
+        self.assertIsNone(_iso_to_us("not a time"))
+        self.assertIsNone(_us_to_iso(None))
+    
+    def test_migrates_baseline_schema(self):
+        """Test TEXT extraction times are converted when an old database is opened."""
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_BASELINE_SCHEMA_SQL)
+        conn.execute(
+            "INSERT INTO messages (sender, send_time, message, message_id, platform) VALUES (?, ?, ?, ?, ?)",
+            ("trader", "10/14/2024 9:30 AM", "Buy 100 AAPL at 150", "1", "json")
+        )
+        insert = """
+            INSERT INTO trading_actions (message_id, action_type, symbol, price, quantity, confidence, extracted_at)
+            VALUES (1, 'buy', ?, 150.0, 100, 0.9, ?)
+        """
+        conn.execute(insert, ("AAPL", "2024-10-14T09:30:00.123456"))  # datetime.now().isoformat(): local
+        conn.execute(insert, ("TSLA", "2024-10-14 13:31:00"))  # CURRENT_TIMESTAMP default: UTC
+        conn.execute(insert, ("QQQ", None))
+        conn.commit()
+        conn.close()
+        
+        db = Database(self.db_path, cache_ttl=0)
+        try:
+            columns = {row[1] for row in db._writer.execute("PRAGMA table_info(trading_actions)")}
+            self.assertNotIn("extracted_at", columns)
+            
+            stored = dict(db._writer.execute("SELECT symbol, extracted_at_us FROM trading_actions"))
+            local = datetime(2024, 10, 14, 13, 30, 0, 123456, tzinfo=timezone.utc)
+            utc = datetime(2024, 10, 14, 13, 31, 0, tzinfo=timezone.utc)
+            self.assertEqual(stored["AAPL"], int(local.timestamp()) * 1_000_000 + 123456)
+            self.assertEqual(stored["TSLA"], int(utc.timestamp()) * 1_000_000)
+            self.assertIsNone(stored["QQQ"])
+            
+            actions = {a["symbol"]: a for a in db.get_recent_actions(min_confidence=0.0)}
+            self.assertEqual(actions["AAPL"]["extracted_at"], "2024-10-14T09:30:00.123456")
+            self.assertEqual(actions["TSLA"]["extracted_at"], "2024-10-14T09:31:00")
+            self.assertEqual(actions["AAPL"]["price"], 150.0)
+            self.assertEqual(actions["AAPL"]["quantity"], 100)
+            self.assertEqual(db.get_action_statistics()["total_actions"], 3)
+        finally:
+            db.close()
+
+
+class TestActionStatistics(unittest.TestCase):
+    """Test the summary tables behind get_action_statistics."""
+    
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._dir.name, "stats.db")
+    
+    def tearDown(self):
+        self._dir.cleanup()
+    
+    def assertStatsMatchActions(self, conn: sqlite3.Connection):
+        """Assert the summary tables equal a GROUP BY over trading_actions."""
+        totals = dict(conn.execute("SELECT key, value FROM action_stats"))
+        count, confidence_sum = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(confidence), 0.0) FROM trading_actions"
+        ).fetchone()
+        self.assertEqual(totals["total"], count)
+        self.assertAlmostEqual(totals["confidence_sum"], confidence_sum)
+        self.assertEqual(
+            dict(conn.execute("SELECT action_type, count FROM action_type_counts")),
+            dict(conn.execute("SELECT action_type, COUNT(*) FROM trading_actions GROUP BY action_type"))
+        )
+        self.assertEqual(
+            dict(conn.execute("SELECT symbol, count FROM symbol_counts")),
+            dict(conn.execute("SELECT symbol, COUNT(*) FROM trading_actions GROUP BY symbol"))
+        )
+    
+    def test_stats_follow_inserts_updates_and_deletes(self):
+        """Test the triggers keep the summary tables current."""
+        db = Database(self.db_path, cache_ttl=0)
+        try:
+            results = []
+            for i, (action_type, symbol) in enumerate([
+                (ActionType.BUY, "AAPL"), (ActionType.SELL, "AAPL"), (ActionType.BUY, "TSLA"),
+                (ActionType.HOLD, "QQQ"), (ActionType.BUY, "AAPL"),
+            ]):
+                message = Message(sender="trader", send_time="10/14/2024 9:30 AM",
+                                  message=f"{action_type.value} {symbol}", message_id=str(i), platform="json")
+                action = TradingAction(action_type=action_type, symbol=symbol, confidence=0.5 + i / 10)
+                results.append((message, [action]))
+            db.save_results_bulk(results)
+            self.assertStatsMatchActions(db._writer)
+            
+            with db._write_conn() as conn:
+                conn.execute("UPDATE trading_actions SET action_type = 'sell', confidence = 0.95 WHERE symbol = 'TSLA'")
+            self.assertStatsMatchActions(db._writer)
+            
+            with db._write_conn() as conn:
+                conn.execute("DELETE FROM trading_actions WHERE symbol IN ('QQQ', 'TSLA')")
+            self.assertStatsMatchActions(db._writer)
+            
+            stats = db.get_action_statistics()
+            self.assertEqual(stats["total_actions"], 3)
+            self.assertEqual(stats["by_type"], {"buy": 2, "sell": 1})
+            self.assertEqual(stats["top_symbols"], {"AAPL": 3})
+        finally:
+            db.close()
+    
+    def test_change_counter_counts_every_write(self):
+        """Test the change counter moves on any insert, update or delete, including ones the totals miss."""
+        db = Database(self.db_path, cache_ttl=0)
+        try:
+            def changes():
+                return db._writer.execute("SELECT value FROM action_stats WHERE key = 'changes'").fetchone()[0]
+            
+            self.assertEqual(changes(), 0)
+            message = Message(sender="trader", send_time="10/14/2024 9:30 AM",
+                              message="Buy AAPL", message_id="1", platform="json")
+            db.save_results_bulk([(message, [TradingAction(action_type=ActionType.BUY, symbol="AAPL", confidence=0.9)])])
+            self.assertEqual(changes(), 2)
+            
+            for sql in (
+                "UPDATE trading_actions SET action_type = 'sell', symbol = 'MSFT'",
+                "UPDATE trading_actions SET price = 150.0",
+                "UPDATE messages SET message = 'Sell MSFT'",
+                "DELETE FROM trading_actions",
+            ):
+                before = changes()
+                with db._write_conn() as conn:
+                    conn.execute(sql)
+                self.assertEqual(changes(), before + 1, sql)
+        finally:
+            db.close()
+    
+    def test_stats_backfilled_for_existing_rows(self):
+        """Test opening a database that predates the summary tables fills them in."""
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_BASELINE_SCHEMA_SQL)
+        conn.executemany(
+            "INSERT INTO trading_actions (action_type, symbol, confidence) VALUES (?, ?, ?)",
+            [("buy", "AAPL", 0.9), ("sell", "AAPL", 0.8), ("buy", "NVDA", 0.7)]
+        )
+        conn.commit()
+        conn.close()
+        
+        db = Database(self.db_path, cache_ttl=0)
+        try:
+            self.assertStatsMatchActions(db._writer)
+            self.assertEqual(db.get_action_statistics()["average_confidence"], 0.8)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
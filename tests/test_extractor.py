@@ -1,10 +1,16 @@
 """Unit tests for trading action extraction."""
 
 import unittest
+from unittest import mock
+from src.extractors.circuit_breaker import CircuitBreaker
+from src.extractors.llm_extractor import LLMExtractor, ExtractionUnavailableError, HAS_OPENAI
 from src.models.message import Message
 from src.models.trading_action import TradingAction, ActionType
 from src.services.validator import ActionValidator
 
+if HAS_OPENAI:
+    import openai
+
 
 class TestTradingAction(unittest.TestCase):
     """Test TradingAction model."""
@@ -56,6 +62,101 @@ class TestValidator(unittest.TestCase):
             confidence=0.5
         )
         self.assertFalse(self.validator.validate(action))
+    
+    def test_filter_matches_validate(self):
+        """Test filter keeps exactly the actions validate accepts."""
+        actions = [
+            TradingAction(action_type=ActionType.BUY, symbol="AAPL", price=150.0, quantity=100, confidence=0.9),
+            TradingAction(action_type=ActionType.SELL, symbol="QQQ", price=-1.0, confidence=0.9),
+            TradingAction(action_type=ActionType.UNKNOWN, symbol="TSLA", confidence=0.9),
+            TradingAction(action_type=ActionType.HOLD, symbol="BRK.B", confidence=0.8),
+            TradingAction(action_type=ActionType.BUY, symbol="NOT A SYMBOL", confidence=0.9),
+            TradingAction(action_type=ActionType.BUY, symbol="SPY", confidence=0.5),
+        ]
+        expected = [action for action in actions if self.validator.validate(action)]
+        self.assertEqual(self.validator.filter(actions), expected)
+
+
+
+@unittest.skipUnless(HAS_OPENAI, "openai not installed")
+class TestExtractionUnavailable(unittest.TestCase):
+    """Test extraction when the LLM provider cannot answer."""
+    
+    REPLY = '{"actions": [{"action_type": "buy", "symbol": "AAPL", "price": 150, "quantity": 100, "confidence": 0.9}]}'
+    
+    def setUp(self):
+        self.breaker = CircuitBreaker(min_calls=2, cooldown=60.0)
+        self.extractor = LLMExtractor(provider="openai", api_key="test", circuit_breaker=self.breaker)
+        self.addCleanup(self.extractor.close)
+        self.message = Message(sender="trader", send_time="10/14/2024 9:30 AM", message="Buy 100 AAPL at 150")
+    
+    def _reply_with(self, *outcomes):
+        """Make the API call raise or return each of outcomes in turn."""
+        patcher = mock.patch.object(self.extractor, "_extract_with_openai", side_effect=list(outcomes))
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+    
+    def test_transient_error_is_not_no_actions(self):
+        """Test a connection failure raises instead of returning [], and is not cached."""
+        api = self._reply_with(openai.APIConnectionError(request=None), self.REPLY)
+        with self.assertRaises(ExtractionUnavailableError) as raised:
+            self.extractor.extract(self.message)
+        self.assertFalse(raised.exception.circuit_open)
+        
+        actions = self.extractor.extract(self.message)
+        self.assertEqual([a.symbol for a in actions], ["AAPL"])
+        self.assertEqual(api.call_count, 2)
+    
+    def test_open_circuit_fails_fast(self):
+        """Test no call is made while the breaker is open, and retry_after is reported."""
+        api = self._reply_with(openai.APIConnectionError(request=None), openai.APIConnectionError(request=None))
+        for _ in range(2):
+            with self.assertRaises(ExtractionUnavailableError):
+                self.extractor.extract(self.message)
+        self.assertTrue(self.breaker.is_open)
+        
+        with self.assertRaises(ExtractionUnavailableError) as raised:
+            self.extractor.extract(self.message)
+        self.assertTrue(raised.exception.circuit_open)
+        self.assertGreater(raised.exception.retry_after, 0.0)
+        self.assertEqual(api.call_count, 2)
+    
+    def test_other_errors_return_no_actions(self):
+        """Test an error that is not the provider being unavailable gives [] without tripping the breaker."""
+        self._reply_with(ValueError("bad request"), ValueError("bad request"))
+        with mock.patch("builtins.print"):
+            self.assertEqual(self.extractor.extract(self.message), [])
+            self.assertEqual(self.extractor.extract(self.message), [])
+        self.assertFalse(self.breaker.is_open)
+
+
+@unittest.skipUnless(HAS_OPENAI, "openai not installed")
+class TestExtractBatch(unittest.TestCase):
+    """Test packing several messages into one extraction request."""
+    
+    def setUp(self):
+        self.extractor = LLMExtractor(provider="openai", api_key="test")
+        self.addCleanup(self.extractor.close)
+        self.messages = [
+            Message(sender="trader", send_time="10/14/2024 9:30 AM", message=f"Buy 100 {symbol} at 150")
+            for symbol in ("AAPL", "TSLA", "NVDA")
+        ]
+    
+    def test_retried_messages_are_looked_up_once(self):
+        """Test messages left out of a packed reply, or alone in a chunk, are not looked up again."""
+        replies = [
+            '{"1": [{"action_type": "buy", "symbol": "AAPL", "confidence": 0.9}]}',  # leaves out TSLA
+            '{"action_type": "buy", "symbol": "TSLA", "confidence": 0.9}',
+            '{"action_type": "buy", "symbol": "NVDA", "confidence": 0.9}',
+        ]
+        with mock.patch.object(self.extractor, "_extract_with_openai", side_effect=replies) as api, \
+                mock.patch.object(self.extractor, "_lookup", wraps=self.extractor._lookup) as lookup:
+            results = self.extractor.extract_batch(self.messages, pack_size=2)
+        self.assertEqual([results[i][0].symbol for i in range(3)], ["AAPL", "TSLA", "NVDA"])
+        self.assertEqual(api.call_count, 3)
+        self.assertEqual(lookup.call_count, 3)
+        self.assertEqual(self.extractor.cache.misses, 3)
+        self.assertEqual(len(self.extractor.cache), 3)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+"""Unit tests for the message processor's handling of provider outages."""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from src.extractors.llm_extractor import ExtractionUnavailableError
+from src.services import message_processor
+from src.services.message_processor import MessageProcessor, _MAX_OUTAGE, _MAX_UNAVAILABLE_ATTEMPTS
+
+
+class _Outage:
+    """Extraction call that raises the given errors in turn, then returns result."""
+    
+    def __init__(self, errors, result=None):
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+def _failed(retry_after: float = 0.0) -> ExtractionUnavailableError:
+    return ExtractionUnavailableError("endpoint down", retry_after=retry_after)
+
+
+def _circuit_open(retry_after: float = 60.0) -> ExtractionUnavailableError:
+    return ExtractionUnavailableError("circuit open", retry_after=retry_after, circuit_open=True)
+
+
+class TestUnavailableRetries(unittest.TestCase):
+    """Test retrying and giving up while the LLM provider is unavailable."""
+    
+    def setUp(self):
+        self.now = 0.0
+        self.sleeps = []
+        
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+        
+        for patcher in (
+            mock.patch.object(message_processor.time, "monotonic", lambda: self.now),
+            mock.patch.object(message_processor.time, "sleep", sleep),
+            mock.patch("builtins.print"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.processor = MessageProcessor(None, None, None, None)
+    
+    def test_retries_until_available(self):
+        """Test an outage is waited out and the eventual result returned."""
+        extract = _Outage([_failed(), _circuit_open(60.0), _circuit_open(30.0)], result=["actions"])
+        self.assertEqual(self.processor._extract_when_available(extract, 1), ["actions"])
+        self.assertEqual(extract.calls, 4)
+        self.assertEqual(self.sleeps, [1.0, 60.0, 30.0])
+        self.assertEqual(self.processor.unavailable_skipped, 0)
+    
+    def test_gives_up_after_failed_calls(self):
+        """Test a message is given up, unsaved, after _MAX_UNAVAILABLE_ATTEMPTS failed calls."""
+        extract = _Outage([_failed()] * 10)
+        self.assertIsNone(self.processor._extract_when_available(extract, 3))
+        self.assertEqual(extract.calls, _MAX_UNAVAILABLE_ATTEMPTS)
+        self.assertEqual(self.processor.unavailable_skipped, 3)
+    
+    def test_open_circuit_waits_do_not_count(self):
+        """Test waiting for an open circuit is not a failed call."""
+        errors = [_failed(), _circuit_open(1.0)] * (_MAX_UNAVAILABLE_ATTEMPTS - 1)
+        extract = _Outage(errors, result=[])
+        self.assertEqual(self.processor._extract_when_available(extract, 1), [])
+        self.assertEqual(self.processor.unavailable_skipped, 0)
+    
+    def test_sustained_outage_gives_up_without_waiting(self):
+        """Test once nothing succeeded for _MAX_OUTAGE seconds, messages are given up at once."""
+        first = _Outage([_circuit_open(_MAX_OUTAGE)] * 10)
+        self.assertIsNone(self.processor._extract_when_available(first, 1))
+        self.assertEqual(first.calls, 2)
+        
+        sleeps = len(self.sleeps)
+        for _ in range(50):
+            self.assertIsNone(self.processor._extract_when_available(_Outage([_circuit_open()]), 1))
+        self.assertEqual(len(self.sleeps), sleeps)
+        self.assertEqual(self.processor.unavailable_skipped, 51)
+    
+    def test_success_ends_the_outage(self):
+        """Test a successful extraction resets the outage clock."""
+        self.processor._extract_when_available(_Outage([_failed(_MAX_OUTAGE - 10)], result=[]), 1)
+        self.assertIsNone(self.processor._unavailable_since)
+        self.now += _MAX_OUTAGE
+        extract = _Outage([_failed()], result=["actions"])
+        self.assertEqual(self.processor._extract_when_available(extract, 1), ["actions"])
+    
+    def test_async_gives_up_after_failed_calls(self):
+        """Test the async path shares the give-up limit."""
+        extract = _Outage([_failed()] * 10)
+        
+        async def call():
+            return extract()
+        
+        with mock.patch.object(message_processor.asyncio, "sleep", mock.AsyncMock()):
+            self.assertIsNone(asyncio.run(self.processor._aextract_when_available(call)))
+        self.assertEqual(extract.calls, _MAX_UNAVAILABLE_ATTEMPTS)
+        self.assertEqual(self.processor.unavailable_skipped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
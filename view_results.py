@@ -7,7 +7,7 @@ import pandas as pd
 db = Database()
 
 # Get all actions
-actions = db.get_recent_actions(limit=1000, min_confidence=0.0)
+actions = db.get_recent_actions_df(limit=1000, min_confidence=0.0)
 stats = db.get_action_statistics()
 
 print("=" * 80)
@@ -23,21 +23,19 @@ if stats['top_symbols']:
 print(f"\n📋 All Extracted Actions ({len(actions)} total):")
 print("-" * 80)
 
-# Create DataFrame for better display
-df_data = []
-for action in actions:
-    df_data.append({
-        'Action': action['action_type'].upper(),
-        'Symbol': action.get('symbol', 'N/A'),
-        'Price': f"${action.get('price', 'N/A')}" if action.get('price') else 'N/A',
-        'Quantity': action.get('quantity', 'N/A'),
-        'Confidence': f"{action.get('confidence', 0):.2f}",
-        'Signal Time': action.get('action_signal_time', 'N/A'),
-        'Sender': action.get('sender', 'N/A'),
-        'Message': (action.get('message', '')[:50] + '...') if action.get('message') else 'N/A'
-    })
-
-df = pd.DataFrame(df_data)
+# Format the columns for display
+price = actions['price']
+message = actions['message']
+df = pd.DataFrame({
+    'Action': actions['action_type'].str.upper(),
+    'Symbol': actions['symbol'],
+    'Price': ('$' + price.astype(str)).where(price.notna() & (price != 0), 'N/A'),
+    'Quantity': actions['quantity'],
+    'Confidence': actions['confidence'].map('{:.2f}'.format),
+    'Signal Time': actions['action_signal_time'],
+    'Sender': actions['sender'],
+    'Message': (message.str[:50] + '...').where(message.notna() & (message != ''), 'N/A')
+})
 pd.set_option('display.max_rows', None)
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', None)